@@ -1,24 +1,47 @@
 #!/usr/bin/env python3
 """ """
 
+import bisect
 import json
 import logging
 import os
+import pickle
+import queue
+import re
 import sys
+import threading
 import time
+from collections import Counter, OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed, wait
 from datetime import datetime, timedelta
-from typing import Any, Dict, List
+from datetime import time as dt_time
+from enum import IntEnum
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
 
+import matplotlib.dates as mdates
 import mplfinance as mpf
 
 # 数据处理和图表
+import numpy as np
 import pandas as pd
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 from matplotlib.figure import Figure
 
 # PyQt5 界面组件
-from PyQt5.QtCore import QObject, QSize, Qt, QThread, QTimer, pyqtSignal
-from PyQt5.QtGui import QColor, QFont, QIcon
+from PyQt5.QtCore import (
+    QAbstractListModel,
+    QAbstractTableModel,
+    QItemSelectionModel,
+    QModelIndex,
+    QObject,
+    QSize,
+    Qt,
+    QThread,
+    QTimer,
+    pyqtSignal,
+)
+from PyQt5.QtGui import QBrush, QColor, QFont, QIcon, QValidator
 from PyQt5.QtWidgets import (
     QAction,
     QApplication,
@@ -27,14 +50,14 @@ from PyQt5.QtWidgets import (
     QDialog,
     QDialogButtonBox,
     QDoubleSpinBox,
+    QFileDialog,
     QFormLayout,
     QGroupBox,
     QHBoxLayout,
     QHeaderView,
     QLabel,
     QLineEdit,
-    QListWidget,
-    QListWidgetItem,
+    QListView,
     QMainWindow,
     QMenu,
     QMessageBox,
@@ -45,6 +68,7 @@ from PyQt5.QtWidgets import (
     QStatusBar,
     QTableWidget,
     QTableWidgetItem,
+    QTableView,
     QTabWidget,
     QTextEdit,
     QToolBar,
@@ -108,6 +132,26 @@ class RealExecutionEngine(ExecutionEngine):
             )
 
 
+class TradeType(IntEnum):
+    """交易方式（作为交易对话框下拉框的 userData，按值分派而非解析文本）"""
+
+    LIMIT = 0
+    MARKET = 1
+    OPPOSITE = 2
+    SAME = 3
+    BEST5 = 4
+
+
+# 交易方式下拉项：(名称前缀, 交易方式)，显示文本为 前缀 + 买入/卖出
+_TRADE_TYPE_ITEMS = (
+    ("限价", TradeType.LIMIT),
+    ("市价", TradeType.MARKET),
+    ("对手价", TradeType.OPPOSITE),
+    ("本方价", TradeType.SAME),
+    ("最优五档", TradeType.BEST5),
+)
+
+
 # 交易接口
 # 使用连接修复补丁
 try:
@@ -193,6 +237,38 @@ except ImportError:
     ak = None
     AKSHARE_AVAILABLE = False
 
+try:
+    from numba import njit
+
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """numba 未安装时的空装饰器，指标内核按纯 Python 执行"""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+try:
+    from rapidfuzz import fuzz, process
+
+    RAPIDFUZZ_AVAILABLE = True
+except ImportError:
+    fuzz = process = None
+    RAPIDFUZZ_AVAILABLE = False
+
+try:
+    import psutil
+
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    psutil = None
+    PSUTIL_AVAILABLE = False
+
+# 掘金终端进程映像名（小写，按全名比较）
+_GOLDMINER_NAME = "goldminer3.exe"
+
 # ================================
 # 配置和工具类
 # ================================
@@ -235,6 +311,7 @@ class Config:
             "display": {
                 "default_period": "15m",
                 "chart_indicators": ["MA5", "MA10", "MACD"],
+                "show_signals": False,  # K线图上标注交易信号
             },
         }
 
@@ -264,6 +341,10 @@ class Config:
                 return default
         return value
 
+    def get_many(self, keys: List[str], default=None) -> tuple:
+        """一次获取多个配置值，按 keys 顺序返回元组"""
+        return tuple(self.get(key, default) for key in keys)
+
     def set(self, key: str, value: Any):
         """设置配置值"""
         keys = key.split(".")
@@ -326,13 +407,36 @@ class MyQuantClient:
         self.connected = False
         self.account_id = None
         self.token = None
+        # 连接握手串行执行；记录成功连接时的 (token, account_id) 配置
+        self._connect_lock = threading.Lock()
+        self._connected_with = None
 
         # 数据缓存相关属性
         self.data_cache = {}
         self.cache_time = {}
         self.cache_expiry = 5  # 缓存过期时间（秒）
+        # 持仓/账户查询缓存：{(查询名, 账户ID): (monotonic 时刻, 结果)}，下单/撤单后清空
+        self._query_cache = {}
+        self.query_cache_ttl = 10.0
+        self._query_generation = 0  # 每次清空缓存加一，跨越清空的查询结果不写入缓存
+
+    def connect(self, force: bool = False) -> bool:
+        """连接到掘金客户端；已用相同配置连接成功时直接返回，不重复握手
+
+        force=True（连接测试、重连）时总是重新握手
+        """
+        settings = (
+            self.config.get("myquant.token"),
+            self.config.get("myquant.account_id"),
+        )
+        with self._connect_lock:
+            if not force and self.connected and self._connected_with == settings:
+                return True
+            connected = self._connect()
+            self._connected_with = settings if connected else None
+            return connected
 
-    def connect(self) -> bool:
+    def _connect(self) -> bool:
         """连接到掘金客户端 - 优化版，减少连接测试方法以提高响应速度"""
         if not MYQUANT_AVAILABLE:
             logging.error("MyQuant API不可用，请检查掘金终端安装")
@@ -354,8 +458,6 @@ class MyQuantClient:
                 logging.info("使用默认仿真账户ID")
 
             # 使用threading.Timer实现超时控制（参考v101）
-            import threading
-
             timeout_occurred = threading.Event()
             connection_success = threading.Event()
 
@@ -481,8 +583,48 @@ class MyQuantClient:
         """检查连接状态"""
         return self.connected and MYQUANT_AVAILABLE
 
-    def get_positions(self) -> List[Dict]:
-        """获取持仓信息"""
+    def _handle_query_error(self, error: Exception):
+        """查询异常属于连接错误时清除连接状态，下次 connect() 重新握手"""
+        text = str(error).lower()
+        if not (
+            isinstance(error, (ConnectionError, TimeoutError))
+            or "connect" in text
+            or "连接" in text
+        ):
+            return
+        with self._connect_lock:
+            self.connected = False
+            self._connected_with = None
+        self.invalidate_query_cache()
+        logging.warning("⚠️ MyQuant连接已断开，下次连接将重新握手")
+
+    def _cached_query(self, name: str, fetch, force_refresh: bool = False):
+        """按账户缓存查询结果 query_cache_ttl 秒，未连接时不缓存"""
+        if not self.is_connected():
+            return fetch()
+        key = (name, self.account_id)
+        now = time.monotonic()
+        if not force_refresh:
+            cached = self._query_cache.get(key)
+            if cached is not None and now - cached[0] < self.query_cache_ttl:
+                return cached[1]
+        generation = self._query_generation
+        result = fetch()
+        if generation == self._query_generation:
+            self._query_cache[key] = (now, result)
+        return result
+
+    def invalidate_query_cache(self):
+        """清空持仓/账户查询缓存（下单、撤单后调用）"""
+        self._query_generation += 1
+        self._query_cache.clear()
+
+    def get_positions(self, force_refresh: bool = False) -> List[Dict]:
+        """获取持仓信息（短时缓存，force_refresh 强制重新查询）"""
+        return self._cached_query("positions", self._fetch_positions, force_refresh)
+
+    def _fetch_positions(self) -> List[Dict]:
+        """查询持仓信息"""
         if not self.is_connected():
             return []
 
@@ -540,11 +682,16 @@ class MyQuantClient:
                 return []
         except Exception as e:
             logging.error(f"[执行引擎] 获取持仓异常: {e}")
+            self._handle_query_error(e)
             return []
 
     # 账户信息获取方法
-    def get_account_info(self) -> Dict:
-        """获取账户资金信息"""
+    def get_account_info(self, force_refresh: bool = False) -> Dict:
+        """获取账户资金信息（短时缓存，force_refresh 强制重新查询）"""
+        return self._cached_query("account", self._fetch_account_info, force_refresh)
+
+    def _fetch_account_info(self) -> Dict:
+        """查询账户资金信息"""
         if not self.is_connected():
             return {}
 
@@ -594,6 +741,7 @@ class MyQuantClient:
             return api_account
         except Exception as e:
             logging.error(f"获取账户信息失败: {e}")
+            self._handle_query_error(e)
             # 如果出现异常，尝试从配置文件获取保存的账户信息
             if self.config.get("account.save_account_info", True):
                 config_account = {
@@ -606,6 +754,38 @@ class MyQuantClient:
                 return config_account
             return {}
 
+    def get_snapshot(self, force_refresh: bool = False) -> Dict:
+        """一次获取持仓与账户信息（两个查询并发执行）
+
+        返回 {"positions": [...], "account": {...}, "errors": {字段: 错误信息}}
+        """
+        snapshot = {"positions": [], "account": {}, "errors": {}}
+        if not self.is_connected():
+            return snapshot
+
+        # 账户查询放到守护线程，与当前线程的持仓查询并发；gm 调用卡死时不阻塞程序退出
+        account_future = Future()
+
+        def account_worker():
+            try:
+                account_future.set_result(self.get_account_info(force_refresh))
+            except Exception as e:
+                account_future.set_exception(e)
+
+        thread = threading.Thread(target=account_worker)
+        thread.daemon = True
+        thread.start()
+
+        try:
+            snapshot["positions"] = self.get_positions(force_refresh)
+        except Exception as e:
+            snapshot["errors"]["positions"] = str(e)
+        try:
+            snapshot["account"] = account_future.result()
+        except Exception as e:
+            snapshot["errors"]["account"] = str(e)
+        return snapshot
+
     # 交易权限检查方法
     def check_trading_permissions(self) -> Dict:
         """检查交易权限，包括科创板权限"""
@@ -1285,6 +1465,9 @@ class MyQuantClient:
             error_msg = f"{action}订单执行异常: {str(e)}"
             logging.error(error_msg)
             return {"success": False, "message": error_msg}
+        finally:
+            # 下单会改变持仓与资金；在调用返回后清空，避免下单期间的查询把旧数据缓存下来
+            self.invalidate_query_cache()
 
     def cancel_order(self, order_id: str) -> Dict:
         """撤销订单
@@ -1310,6 +1493,9 @@ class MyQuantClient:
             error_msg = f"撤销订单失败: {str(e)}"
             logging.error(error_msg)
             return {"success": False, "message": error_msg}
+        finally:
+            # 撤单调用返回后再清空持仓/账户缓存
+            self.invalidate_query_cache()
 
     def get_orders(self) -> List[Dict]:
         """获取当日所有订单
@@ -1329,6 +1515,7 @@ class MyQuantClient:
 
         except Exception as e:
             logging.error(f"获取订单列表失败: {str(e)}")
+            self._handle_query_error(e)
             return []
 
     def get_unfinished_orders(self) -> List[Dict]:
@@ -1349,8 +1536,28 @@ class MyQuantClient:
 
         except Exception as e:
             logging.error(f"获取未完成订单失败: {str(e)}")
+            self._handle_query_error(e)
             return []
 
+    def get_order(self, order_id: str, unfinished_only: bool = False) -> Optional[Dict]:
+        """按订单ID查询单个订单
+
+        gm 没有单笔订单查询接口，只能在当日订单中查找；
+        unfinished_only 为 True 时只查未完成订单，返回数据更少
+
+        Returns:
+            Optional[Dict]: 订单，未找到时返回 None
+        """
+        if unfinished_only:
+            orders = self.get_unfinished_orders()
+        else:
+            orders = self.get_orders()
+        for order in orders:
+            oid = order.get("cl_ord_id") or order.get("order_id") or ""
+            if str(oid) == order_id:
+                return order
+        return None
+
 
 class StockPool:
     """交易池管理类"""
@@ -1555,6 +1762,336 @@ class TradingRecorder:
 
 # ================================
 # 信号类
+# ================================
+# 技术指标计算内核（模块级）
+# ================================
+# 内核接收 float32/float64 ndarray，内部以 float64 累加并返回 float64，
+# 绘图直接按尾部切片使用，不再包装为 Series。
+# 未开启 fastmath：指标前段依赖 NaN 判断，fastmath 会假定不存在 NaN。
+
+
+@njit(cache=True, error_model="numpy")
+def _sma_loop(values, period):
+    """简单移动平均，语义同 rolling(period).mean()"""
+    n = values.shape[0]
+    out = np.full(n, np.nan)
+    acc = 0.0
+    nan_count = 0
+    for i in range(n):
+        v = values[i]
+        if v != v:
+            nan_count += 1
+        else:
+            acc += v
+        if i >= period:
+            old = values[i - period]
+            if old != old:
+                nan_count -= 1
+            else:
+                acc -= old
+        if i >= period - 1 and nan_count == 0:
+            out[i] = acc / period
+    return out
+
+
+@njit(cache=True, error_model="numpy")
+def _sma_multi(values, periods):
+    """多周期简单移动平均，一次遍历完成，返回 (len(values), len(periods)) 数组"""
+    n = values.shape[0]
+    m = periods.shape[0]
+    out = np.full((n, m), np.nan)
+    acc = np.zeros(m)
+    nan_count = np.zeros(m, dtype=np.int64)
+    for i in range(n):
+        v = values[i]
+        for k in range(m):
+            period = periods[k]
+            if v != v:
+                nan_count[k] += 1
+            else:
+                acc[k] += v
+            if i >= period:
+                old = values[i - period]
+                if old != old:
+                    nan_count[k] -= 1
+                else:
+                    acc[k] -= old
+            if i >= period - 1 and nan_count[k] == 0:
+                out[i, k] = acc[k] / period
+    return out
+
+
+@njit(cache=True, error_model="numpy")
+def _ema_loop(values, alpha):
+    """指数加权平均，语义同 ewm(alpha=alpha, adjust=True).mean()"""
+    n = values.shape[0]
+    out = np.full(n, np.nan)
+    if n == 0:
+        return out
+    old_wt_factor = 1.0 - alpha
+    weighted = values[0]
+    old_wt = 1.0
+    out[0] = weighted
+    for i in range(1, n):
+        cur = values[i]
+        if weighted == weighted:
+            old_wt *= old_wt_factor
+            if cur == cur:
+                if weighted != cur:
+                    weighted = (old_wt * weighted + cur) / (old_wt + 1.0)
+                old_wt += 1.0
+        elif cur == cur:
+            weighted = cur
+        out[i] = weighted
+    return out
+
+
+@njit(cache=True, error_model="numpy")
+def _ema_resume(values, alpha, prev):
+    """从上一个 EMA 值 prev 接续递推（充分预热后与 adjust=True 结果一致）"""
+    n = values.shape[0]
+    out = np.empty(n)
+    weighted = prev
+    for i in range(n):
+        cur = values[i]
+        if cur == cur:
+            if weighted == weighted:
+                weighted += alpha * (cur - weighted)
+            else:
+                weighted = cur
+        out[i] = weighted
+    return out
+
+
+@njit(cache=True, error_model="numpy")
+def _macd_loop(close, fast, slow, signal):
+    """MACD：返回 (快线EMA, 慢线EMA, DIF, DEA, 柱)，EMA 供增量计算接续"""
+    ema_fast = _ema_loop(close, 2.0 / (fast + 1))
+    ema_slow = _ema_loop(close, 2.0 / (slow + 1))
+    dif = ema_fast - ema_slow
+    dea = _ema_loop(dif, 2.0 / (signal + 1))
+    return ema_fast, ema_slow, dif, dea, dif - dea
+
+
+@njit(cache=True, error_model="numpy")
+def _rsi_loop(close, period):
+    """RSI，涨跌幅取简单移动平均"""
+    n = close.shape[0]
+    gain = np.zeros(n)
+    loss = np.zeros(n)
+    for i in range(1, n):
+        delta = close[i] - close[i - 1]
+        if delta > 0:
+            gain[i] = delta
+        elif delta < 0:
+            loss[i] = -delta
+    avg_gain = _sma_loop(gain, period)
+    avg_loss = _sma_loop(loss, period)
+    return 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+
+
+@njit(cache=True, error_model="numpy")
+def _rsv_loop(high, low, close, period):
+    """KDJ 未成熟随机值 RSV"""
+    n = close.shape[0]
+    rsv = np.full(n, np.nan)
+    for i in range(period - 1, n):
+        lo = low[i]
+        hi = high[i]
+        for j in range(i - period + 1, i):
+            if low[j] < lo:
+                lo = low[j]
+            if high[j] > hi:
+                hi = high[j]
+        rsv[i] = (close[i] - lo) / (hi - lo) * 100.0
+    return rsv
+
+
+@njit(cache=True, error_model="numpy")
+def _kdj_loop(high, low, close, period, k_com, d_com):
+    """KDJ：返回 (K, D, J)"""
+    rsv = _rsv_loop(high, low, close, period)
+    k = _ema_loop(rsv, 1.0 / (1.0 + k_com))
+    d = _ema_loop(k, 1.0 / (1.0 + d_com))
+    return k, d, 3.0 * k - 2.0 * d
+
+
+@njit(cache=True, error_model="numpy")
+def _bb_loop(close, period, width):
+    """布林带：返回 (上轨, 中轨, 下轨)，标准差取样本标准差"""
+    n = close.shape[0]
+    middle = _sma_loop(close, period)
+    upper = np.full(n, np.nan)
+    lower = np.full(n, np.nan)
+    for i in range(period - 1, n):
+        mean = middle[i]
+        if mean != mean:
+            continue
+        sq = 0.0
+        for j in range(i - period + 1, i + 1):
+            diff = close[j] - mean
+            sq += diff * diff
+        std = np.sqrt(sq / (period - 1))
+        upper[i] = mean + width * std
+        lower[i] = mean - width * std
+    return upper, middle, lower
+
+
+# ================================
+# K线数据缓存
+# ================================
+
+
+class BarSeries:
+    """单只股票单周期的K线数据，按列存储为 ndarray
+
+    OHLCV 使用 float32（显示和指标精度足够，内存减半），时间戳为 int64 纳秒。
+    """
+
+    __slots__ = (
+        "ts",
+        "open",
+        "high",
+        "low",
+        "close",
+        "volume",
+        "period",
+        "version",
+        "last_update",
+        "indicators",
+        "base",
+        "_index",
+    )
+
+    def __init__(self, ts, open_, high, low, close, volume, period: str):
+        self.ts = ts
+        self.open = open_
+        self.high = high
+        self.low = low
+        self.close = close
+        self.volume = volume
+        self.period = period
+        self.version = 0  # 由 BarStore 写入时分配
+        self.last_update = None  # time.monotonic() 时间戳
+        self.indicators = None  # 该份数据对应的指标计算结果
+        # 增量合并来源：(旧指标, 旧数据保留行数, 新数据中沿用的行数)，用于只算新增K线
+        self.base = None
+        self._index = None
+
+    @classmethod
+    def from_dataframe(cls, df: pd.DataFrame, period: str) -> "BarSeries":
+        """从标准列名（Open/High/Low/Close/Volume）的 DataFrame 构建"""
+        index = pd.DatetimeIndex(df.index)
+        if index.tz is not None:
+            index = index.tz_localize(None)  # 保留本地时间，去掉时区
+        return cls(
+            np.asarray(index, dtype="datetime64[ns]").view(np.int64),
+            df["Open"].to_numpy(dtype=np.float32),
+            df["High"].to_numpy(dtype=np.float32),
+            df["Low"].to_numpy(dtype=np.float32),
+            df["Close"].to_numpy(dtype=np.float32),
+            df["Volume"].to_numpy(dtype=np.float32),
+            period,
+        )
+
+    def __len__(self) -> int:
+        return len(self.ts)
+
+    @property
+    def index(self) -> pd.DatetimeIndex:
+        """时间索引（首次访问时构建）"""
+        if self._index is None:
+            self._index = pd.DatetimeIndex(
+                self.ts.view("datetime64[ns]"), name="date"
+            )
+        return self._index
+
+    @property
+    def stamp(self) -> tuple:
+        """数据标识：(长度, 末根K线时间戳, 数据版本)"""
+        return (len(self.ts), int(self.ts[-1]) if len(self.ts) else 0, self.version)
+
+    def merge(self, recent: "BarSeries", limit: int) -> "BarSeries":
+        """以 recent 覆盖重叠部分并追加新K线，最多保留 limit 根"""
+        keep = self.ts < recent.ts[0]
+        columns = [
+            np.concatenate([old[keep], new])[-limit:]
+            for old, new in zip(self._columns(), recent._columns())
+        ]
+        merged = BarSeries(*columns, period=self.period)
+        if self.indicators is not None:
+            kept = int(keep.sum())
+            merged.base = (self.indicators, kept, len(merged) - len(recent))
+        return merged
+
+    def same_tail(self, recent: "BarSeries") -> bool:
+        """recent 的最后一根K线是否与当前最后一根完全一致"""
+        return all(
+            old[-1] == new[-1]
+            for old, new in zip(self._columns(), recent._columns())
+        )
+
+    def _columns(self) -> tuple:
+        """按构造参数顺序返回全部列"""
+        return (self.ts, self.open, self.high, self.low, self.close, self.volume)
+
+    def as_arrays(self) -> Dict[str, np.ndarray]:
+        """列数组视图，供指标内核直接使用"""
+        return {
+            "ts": self.ts,
+            "open": self.open,
+            "high": self.high,
+            "low": self.low,
+            "close": self.close,
+            "volume": self.volume,
+        }
+
+    def as_dataframe(self, tail: int = 0) -> pd.DataFrame:
+        """构建 mplfinance 所需的 DataFrame，tail>0 时只构建最后 tail 根"""
+        start = -tail if tail else 0
+        return pd.DataFrame(
+            {
+                "Open": self.open[start:],
+                "High": self.high[start:],
+                "Low": self.low[start:],
+                "Close": self.close[start:],
+                "Volume": self.volume[start:],
+            },
+            index=self.index[start:],
+        )
+
+
+class BarStore:
+    """K线缓存：按 (代码, 周期) 存储 BarSeries，超出容量时淘汰最久未使用的条目"""
+
+    def __init__(self, maxsize: int = 64):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._version = 0
+
+    def get(self, code: str, period: str):
+        """获取缓存数据，不存在时返回 None"""
+        bars = self._data.get((code, period))
+        if bars is not None:
+            self._data.move_to_end((code, period))
+        return bars
+
+    def put(self, code: str, period: str, bars: BarSeries):
+        """写入缓存并分配新的数据版本号"""
+        self._version += 1
+        bars.version = self._version
+        self._data[(code, period)] = bars
+        self._data.move_to_end((code, period))
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def clear(self):
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
 # ================================
 # 交易策略引擎
 # ================================
@@ -1592,18 +2129,22 @@ class SignalEngine:
         self.amplitude_threshold = amplitude_threshold
         self.high_low_diff_threshold = high_low_diff_threshold
 
+    def reset(self):
+        """清空上一次的检测结果"""
+        self.results.clear()
+
     def run_all_strategies(self, data, indicators, symbol=""):
         """运行所有策略信号检测"""
-        self.results.clear()
+        self.reset()
         if "Close" not in data:
             return
 
-        close = data.get("Close")
+        close = np.asarray(data.get("Close"))
 
         # 基础趋势判断
         ma60 = indicators.get("MA60")
-        main_trend_bull = close.iloc[-1] > ma60.iloc[-1] if ma60 is not None else False
-        main_trend_bear = close.iloc[-1] < ma60.iloc[-1] if ma60 is not None else False
+        main_trend_bull = close[-1] > ma60[-1] if ma60 is not None else False
+        main_trend_bear = close[-1] < ma60[-1] if ma60 is not None else False
 
         # 1. 均线信号检测
         self._detect_ma_signals(indicators, main_trend_bull, main_trend_bear, symbol)
@@ -1621,7 +2162,8 @@ class SignalEngine:
         for period in ma_periods:
             ma_col = f"MA{period}"
             if ma_col in indicators:
-                ma_values = indicators[ma_col].dropna().values
+                ma_values = np.asarray(indicators[ma_col])
+                ma_values = ma_values[~np.isnan(ma_values)]
                 if len(ma_values) >= 6:
                     for direction in ["bottom", "top"]:
                         if (direction == "bottom" and main_trend_bull) or (
@@ -1640,15 +2182,15 @@ class SignalEngine:
         if "MACD" not in indicators or "MACD_Signal" not in indicators:
             return
 
-        macd = indicators["MACD"]
-        signal = indicators["MACD_Signal"]
+        macd = np.asarray(indicators["MACD"])
+        signal = np.asarray(indicators["MACD_Signal"])
 
         if len(macd) < 3:
             return
 
         # MACD金叉死叉
-        current_cross = macd.iloc[-1] - signal.iloc[-1]
-        prev_cross = macd.iloc[-2] - signal.iloc[-2]
+        current_cross = macd[-1] - signal[-1]
+        prev_cross = macd[-2] - signal[-2]
 
         if prev_cross <= 0 and current_cross > 0:  # 金叉
             score = self.label_map["macd_golden_cross"][1]
@@ -1662,11 +2204,11 @@ class SignalEngine:
         if "RSI" not in indicators:
             return
 
-        rsi = indicators["RSI"]
+        rsi = np.asarray(indicators["RSI"])
         if len(rsi) < 3:
             return
 
-        current_rsi = rsi.iloc[-1]
+        current_rsi = rsi[-1]
 
         # RSI超买超卖
         if current_rsi > 70:  # 超买
@@ -1679,8 +2221,6 @@ class SignalEngine:
     def detect_ma_turning_point(
         self, ma_values, direction="bottom", high=None, low=None
     ):
-        import numpy as np
-
         if len(ma_values) < 3:
             return False, -1
         recent = ma_values[-3:]
@@ -1704,9 +2244,9 @@ class SignalEngine:
         )
         if ma5 is None or ma10 is None or ma20 is None or len(ma5) < 1:
             return False, "", -1
-        if ma5.iloc[-1] > ma10.iloc[-1] > ma20.iloc[-1]:
+        if ma5[-1] > ma10[-1] > ma20[-1]:
             return True, "ma_multi_bull", len(ma5) - 1
-        if ma5.iloc[-1] < ma10.iloc[-1] < ma20.iloc[-1]:
+        if ma5[-1] < ma10[-1] < ma20[-1]:
             return True, "ma_multi_bear", len(ma5) - 1
         return False, "", -1
 
@@ -1731,6 +2271,11 @@ class SystemSignals(QObject):
     status_message = pyqtSignal(str)  # 用于显示状态栏消息
     goldminer_not_running = pyqtSignal()  # 掘金终端未运行信号
 
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        # 主线程弹出掘金终端未运行提示后置位，供初始化线程等待
+        self.goldminer_prompt_shown = threading.Event()
+
 
 # ================================
 # 主窗口类
@@ -1740,6 +2285,42 @@ class SystemSignals(QObject):
 class MainWindow(QMainWindow):
     """主窗口类"""
 
+    # 表格数值格式化（预绑定 % 格式化，避免逐格 f-string 解析）
+    _fmt = staticmethod("%.2f".__mod__)
+    _fmt_pct = staticmethod("%.2f%%".__mod__)
+
+    # 交易模式按钮样式
+    _SIM_ON_STYLE = "QPushButton { color: #2196F3; font-weight: bold; background-color: transparent; border: none; }"
+    _REAL_ON_STYLE = "QPushButton { color: #FF5722; font-weight: bold; background-color: transparent; border: none; }"
+    _MODE_OFF_STYLE = "QPushButton { color: gray; background-color: transparent; border: none; }"
+    _last_mode_state = None  # (模拟选中, 实盘选中)，状态未变时跳过样式刷新
+
+    # 均线周期（一次性融合计算）
+    _MA_PERIODS = np.array([5, 10, 20, 60])
+
+    # K线数据获取数量：全量 / 增量
+    _HISTORY_BARS = 250
+    _INTRADAY = frozenset({"1m", "5m", "15m", "60m"})
+    _INCREMENTAL_BARS = 10
+    # 增量计算指标所需的最少沿用K线数（保证窗口回看和 EMA 充分预热）
+    _INCREMENTAL_WARMUP = 200
+
+    # K线数据标准列名映射（mplfinance 兼容）
+    _CHART_COLUMNS = {
+        "开盘": "Open",
+        "最高": "High",
+        "最低": "Low",
+        "收盘": "Close",
+        "成交量": "Volume",
+        "成交额": "Amount",
+        "open": "Open",
+        "high": "High",
+        "low": "Low",
+        "close": "Close",
+        "volume": "Volume",
+        "amount": "Amount",
+    }
+
     def __init__(self):
         super().__init__()
 
@@ -1763,6 +2344,16 @@ class MainWindow(QMainWindow):
         self.zoom_level = 100  # 默认缩放级别
         self.current_main_indicator = "操盘线"  # 主图指标
         self.current_subplot_indicator = "MACD"  # 副图指标
+        # 策略信号引擎只创建一次，数据未变时跳过重复检测
+        self.signal_engine = SignalEngine()
+        self._signal_stamp = None
+        self._last_signal_results = []  # 最近一次检测结果，重绘标注时复用
+        # 当前图表状态与均线线条句柄（用于只更新叠加层/副图）
+        self._chart_state = None
+        self._ma_lines = {}
+        self._bg_price = None  # 主图背景缓存（blit 用）
+        # 共享横轴序号数组（按最大缩放500根预分配），各子图按K线数切片复用
+        self._x_cache = np.arange(500)
         # 图表画布相关属性（延迟初始化）
         self.canvas = None
         self.fig = None
@@ -1784,6 +2375,19 @@ class MainWindow(QMainWindow):
         # 自动刷新定时器
         self.refresh_timer = QTimer()
         self.refresh_timer.timeout.connect(self.refresh_stock_pool)
+        # 客户端数据同步线程
+        self.sync_thread = None
+
+        # 缩放重绘防抖：连续按键只在停顿后重绘一次
+        self._redraw_timer = QTimer(self)
+        self._redraw_timer.setSingleShot(True)
+        self._redraw_timer.setInterval(50)
+        self._redraw_timer.timeout.connect(self.update_chart)
+        # 非交易时间静态绘制标记：静态数据已绘制且交易池未变动时跳过重绘
+        self._static_painted = False
+        self._pool_dirty = True
+        self._last_is_trading = None
+        self._last_connected = None
 
         # 初始化界面
         self.init_ui()
@@ -1907,7 +2511,7 @@ class MainWindow(QMainWindow):
         # 刷新数据
         refresh_action = QAction("刷新数据(&R)", self)
         refresh_action.setStatusTip("刷新交易池数据")
-        refresh_action.triggered.connect(self.refresh_stock_pool)
+        refresh_action.triggered.connect(lambda: self.refresh_stock_pool(force=True))
         tools_menu.addAction(refresh_action)
 
         tools_menu.addSeparator()
@@ -1982,7 +2586,9 @@ class MainWindow(QMainWindow):
         make_toolbutton(
             "permissions.svg", "权限检测", self.check_trading_permissions_dialog
         )
-        make_toolbutton("refresh.svg", "刷新数据", self.refresh_stock_pool)
+        make_toolbutton(
+            "refresh.svg", "刷新数据", lambda: self.refresh_stock_pool(force=True)
+        )
         make_toolbutton("add.svg", "添加股票", self.show_add_stock_dialog)
         toolbar.addSeparator()
         make_toolbutton("data.svg", "历史数据", self.show_historical_data_dialog)
@@ -2221,7 +2827,7 @@ class MainWindow(QMainWindow):
         self.zoom_level = 120  # K线显示数量
         self.current_indicator = "操盘线"
         self.current_subplot_indicator = "MACD"
-        self.data_cache = {}
+        self.data_cache = BarStore(maxsize=64)  # K线缓存：(代码, 周期) -> BarSeries
 
         # 设置图表配色主题
         self.chart_colors = {
@@ -2236,6 +2842,11 @@ class MainWindow(QMainWindow):
             "ma20": "#9C27B0",
             "ma60": "#2196F3",
         }
+        self._rebuild_style()
+
+        # 日期刻度定位器/格式化器只创建一次，每次重绘复用
+        self._date_locator = mdates.AutoDateLocator(minticks=6, maxticks=10)
+        self._date_formatter = mdates.AutoDateFormatter(self._date_locator)
 
         # 配置matplotlib中文字体
         plt.rcParams["font.sans-serif"] = ["SimHei", "Microsoft YaHei"]
@@ -2247,6 +2858,8 @@ class MainWindow(QMainWindow):
 
         # 设置canvas可以接收键盘焦点
         self.canvas.setFocusPolicy(Qt.StrongFocus)
+        # 每次整图重绘后刷新 blit 背景
+        self.canvas.mpl_connect("draw_event", self._on_canvas_draw)
 
         # 创建三个子图：价格图、成交量图、指标图
         # 使用gridspec来更好地控制布局
@@ -2285,6 +2898,32 @@ class MainWindow(QMainWindow):
         self.canvas.draw()
         return self.canvas
 
+    def _rebuild_style(self):
+        """根据 chart_colors 构建 mplfinance 样式（配色变化时调用）"""
+        mc = mpf.make_marketcolors(
+            up=self.chart_colors["up"],
+            down=self.chart_colors["down"],
+            edge={"up": self.chart_colors["up"], "down": self.chart_colors["down"]},
+            wick={"up": self.chart_colors["up"], "down": self.chart_colors["down"]},
+            volume={"up": self.chart_colors["up"], "down": self.chart_colors["down"]},
+        )
+
+        self._mpf_style = mpf.make_mpf_style(
+            base_mpf_style="yahoo",
+            marketcolors=mc,
+            rc={
+                "font.family": "SimHei",
+                "axes.edgecolor": "#CCCCCC",
+                "axes.labelcolor": self.chart_colors["text"],
+                "xtick.color": self.chart_colors["text"],
+                "ytick.color": self.chart_colors["text"],
+                "figure.facecolor": self.chart_colors["bg"],
+                "axes.facecolor": self.chart_colors["ax"],
+                "grid.color": self.chart_colors["grid"],
+                "grid.linestyle": "--",
+            },
+        )
+
     def create_right_panel(self) -> QWidget:
         """创建右侧交易池面板"""
         panel = QWidget()
@@ -2304,7 +2943,7 @@ class MainWindow(QMainWindow):
         self.refresh_pool_button = self._create_icon_button(
             "qt_builtin_refresh_24.png",
             "刷新交易池数据",
-            slot=self.refresh_stock_pool,
+            slot=lambda: self.refresh_stock_pool(force=True),
             size=self.icon_size,
             parent_toolbar=None,
         )
@@ -2405,6 +3044,8 @@ class MainWindow(QMainWindow):
         try:
             # 弹出提示窗口
             self.log("💡 检测到掘金终端未运行，正在显示提示窗口...", "INFO")
+            # 提示框进入模态事件循环后通知初始化线程
+            QTimer.singleShot(0, self.signals.goldminer_prompt_shown.set)
             QMessageBox.warning(
                 self,
                 "掘金终端未运行",
@@ -2459,7 +3100,8 @@ class MainWindow(QMainWindow):
             "QPushButton { font-size: 14px; padding: 8px; background-color: #4CAF50; color: white; }"
         )
 
-        # 刷新交易池显示
+        # 刷新交易池显示（初始化期间交易池已重新加载）
+        self._pool_dirty = True
         try:
             self.refresh_stock_pool()
             # 在交易时间才启动30秒自动刷新定时器
@@ -2507,13 +3149,15 @@ class MainWindow(QMainWindow):
             "QPushButton { font-size: 14px; padding: 8px; background-color: #4CAF50; color: white; }"
         )
 
-        # 刷新交易池显示
+        # 刷新交易池显示（初始化期间交易池已重新加载）
+        self._pool_dirty = True
         self.refresh_stock_pool()
 
         self.log("系统初始化完成！", "SUCCESS")
 
     def update_client_status(self, connected: bool):
         """更新客户端连接状态"""
+        self._pool_dirty = True  # 交易池的连接状态标签需要重绘
         if connected:
             self.status_client_label.setText("✅ 客户端已连接")
             self.status_client_label.setStyleSheet("color: green;")
@@ -2536,6 +3180,7 @@ class MainWindow(QMainWindow):
         if dialog.exec_() == QDialog.Accepted:
             self.config.save_config()
             self.log("设置已保存", "SUCCESS")
+            self.redraw_chart()  # 信号标注开关等显示设置立即生效
 
     def show_historical_data_dialog(self):
         """显示历史数据管理对话框"""
@@ -2566,7 +3211,7 @@ class MainWindow(QMainWindow):
             success = False
             message = ""
 
-            if self.myquant_client.connect():
+            if self.myquant_client.connect(force=True):
                 success = True
                 message = "MyQuant连接成功！"
                 self.log("MyQuant连接测试成功", "SUCCESS")
@@ -2647,9 +3292,34 @@ class MainWindow(QMainWindow):
     # C. 交易池功能
     # ================================
 
-    def refresh_stock_pool(self):
-        """刷新交易池显示，无论是否为交易时间都显示股票和持仓信息"""
-        if not self.myquant_client.is_connected():
+    def refresh_stock_pool(self, force=False):
+        """刷新交易池显示，无论是否为交易时间都显示股票和持仓信息
+
+        force 为 False 时（定时器），非交易时间且交易池无变动则跳过重绘；
+        用户手动刷新传 True，总是重绘
+        """
+        # 检查是否为交易时间
+        is_trading = self.is_trading_time()
+        if is_trading != self._last_is_trading:
+            # 交易/非交易时段切换，静态绘制失效
+            self._last_is_trading = is_trading
+            self._static_painted = False
+        connected = self.myquant_client.is_connected()
+        if connected != self._last_connected:
+            # 连接状态变化，状态标签需要重绘
+            self._last_connected = connected
+            self._pool_dirty = True
+
+        # 非交易时间价格与持仓不变，定时刷新在首次绘制后直接跳过
+        if (
+            not force
+            and not is_trading
+            and self._static_painted
+            and not self._pool_dirty
+        ):
+            return
+
+        if not connected:
             self.log("客户端未连接，显示静态交易池数据", "WARNING")
             self.refresh_status_label.setText("⚠️ 未连接")
             self.refresh_status_label.setStyleSheet(
@@ -2665,8 +3335,6 @@ class MainWindow(QMainWindow):
             """)
             # 不直接返回，继续显示静态交易池数据
 
-        # 检查是否为交易时间
-        is_trading = self.is_trading_time()
         # 更新状态显示
         if is_trading:
             self.refresh_status_label.setText("🔄 刷新中...")
@@ -2717,6 +3385,7 @@ class MainWindow(QMainWindow):
             realtime_data = self.myquant_client.get_realtime_data(codes, force_refresh=True)
 
         # 填充表格
+        fmt, fmt_pct = self._fmt, self._fmt_pct
         for i, (code, name) in enumerate(stocks):
             self.pool_table.setItem(i, 0, QTableWidgetItem(code))
             self.pool_table.setItem(i, 1, QTableWidgetItem(name))
@@ -2733,19 +3402,19 @@ class MainWindow(QMainWindow):
                 logging.debug(f"刷新交易池 - {code}: 价格={price:.2f}, 涨跌幅={change_pct:.2f}%, 数据源={data.get('数据源', '未知')}")
                 
                 # 更新价格
-                price_item = QTableWidgetItem(f"{price:.2f}")
+                price_item = QTableWidgetItem(fmt(price))
                 self.pool_table.setItem(i, 2, price_item)
                 
-                # 涨跌幅颜色处理
-                change_item = QTableWidgetItem(f"{change_pct:.2f}%")
+                # 涨跌幅颜色处理（红涨绿跌）
+                change_item = QTableWidgetItem(fmt_pct(change_pct))
                 if change_pct > 0:
-                    change_item.setForeground(QColor("red"))
+                    change_item.setForeground(_COLOR_BAD)
                 elif change_pct < 0:
-                    change_item.setForeground(QColor("green"))
+                    change_item.setForeground(_COLOR_OK)
                 self.pool_table.setItem(i, 3, change_item)
                 
                 # 更新换手率
-                turnover_item = QTableWidgetItem(f"{turnover_rate:.2f}%")
+                turnover_item = QTableWidgetItem(fmt_pct(turnover_rate))
                 self.pool_table.setItem(i, 4, turnover_item)
                 
                 # 确保表格数据立即更新显示
@@ -2760,12 +3429,13 @@ class MainWindow(QMainWindow):
             status = "持仓" if self.stock_pool.is_position_stock(code) else "监控"
             status_item = QTableWidgetItem(status)
             if status == "持仓":
-                status_item.setForeground(QColor("blue"))
+                status_item.setForeground(_COLOR_INFO)
             self.pool_table.setItem(i, 5, status_item)
 
-        # 更新刷新状态和时间
-        from datetime import datetime
+        self._pool_dirty = False
+        self._static_painted = not is_trading
 
+        # 更新刷新状态和时间
         current_time = datetime.now().strftime("%H:%M:%S")
         if is_trading:
             self.refresh_status_label.setText(f"✅ 已更新 {current_time}")
@@ -2787,13 +3457,10 @@ class MainWindow(QMainWindow):
 
     def is_trading_time(self):
         """检查当前是否为交易时间"""
-        import calendar
-        from datetime import datetime, time
-
         now = datetime.now()
 
         # 检查是否为周末
-        if calendar.day_name[now.weekday()] in ["Saturday", "Sunday"]:
+        if now.weekday() >= 5:
             return False
 
         # 检查是否为节假日（这里仅作为示例，可以扩展为完整的节假日列表）
@@ -2801,10 +3468,10 @@ class MainWindow(QMainWindow):
 
         # 检查时间范围（A股交易时间：9:30-11:30，13:00-15:00）
         current_time = now.time()
-        morning_start = time(9, 30)
-        morning_end = time(11, 30)
-        afternoon_start = time(13, 0)
-        afternoon_end = time(15, 0)
+        morning_start = dt_time(9, 30)
+        morning_end = dt_time(11, 30)
+        afternoon_start = dt_time(13, 0)
+        afternoon_end = dt_time(15, 0)
 
         # 判断是否在交易时间内
         is_morning_trading = morning_start <= current_time <= morning_end
@@ -2907,7 +3574,7 @@ class MainWindow(QMainWindow):
 
         # 刷新选项
         refresh_action = QAction("🔃 刷新交易池", self)
-        refresh_action.triggered.connect(self.refresh_stock_pool)
+        refresh_action.triggered.connect(lambda: self.refresh_stock_pool(force=True))
         menu.addAction(refresh_action)
 
         # 导入选项（可选）
@@ -2953,7 +3620,7 @@ class MainWindow(QMainWindow):
         # 简单的交易对话框
         dialog = TradeDialog(code, name, action, is_simulation, parent=self)
         if dialog.exec_() == QDialog.Accepted:
-            quantity, price, trade_type = dialog.get_trade_info()
+            quantity, price, trade_type, trade_kind = dialog.get_trade_info()
             amount = quantity * price
 
             # 记录交易
@@ -2962,7 +3629,7 @@ class MainWindow(QMainWindow):
             )
 
             # 根据交易类型显示不同的价格信息
-            if "市价" in trade_type:
+            if trade_kind == TradeType.MARKET:
                 price_text = "市价"
             else:
                 price_text = f"{price:.2f}"
@@ -3039,6 +3706,7 @@ class MainWindow(QMainWindow):
     def add_to_pool(self, code: str, name: str):
         """添加股票到交易池"""
         if self.stock_pool.add_stock(code, name):
+            self._pool_dirty = True
             self.log(f"✅ 成功添加股票到交易池: {code} {name}", "SUCCESS")
             # 刷新交易池显示
             self.refresh_stock_pool()
@@ -3048,8 +3716,6 @@ class MainWindow(QMainWindow):
     def remove_from_pool(self, code: str, name: str):
         """从交易池移除股票"""
         # 确认删除对话框
-        from PyQt5.QtWidgets import QMessageBox
-
         reply = QMessageBox.question(
             self,
             "确认删除",
@@ -3060,6 +3726,7 @@ class MainWindow(QMainWindow):
 
         if reply == QMessageBox.Yes:
             if self.stock_pool.remove_stock(code):
+                self._pool_dirty = True
                 self.log(f"✅ 成功从交易池移除股票: {code} {name}", "SUCCESS")
                 # 刷新交易池显示
                 self.refresh_stock_pool()
@@ -3084,8 +3751,6 @@ class MainWindow(QMainWindow):
 
     def import_stock_list(self):
         """导入股票列表"""
-        from PyQt5.QtWidgets import QFileDialog, QMessageBox
-
         # 选择文件
         file_path, _ = QFileDialog.getOpenFileName(
             self,
@@ -3105,8 +3770,6 @@ class MainWindow(QMainWindow):
             if file_path.lower().endswith(".csv"):
                 # CSV文件处理
                 try:
-                    import pandas as pd
-
                     df = pd.read_csv(file_path, encoding="utf-8")
 
                     # 尝试不同的列名
@@ -3161,40 +3824,35 @@ class MainWindow(QMainWindow):
                                         duplicate_count += 1
 
             else:
-                # 文本文件处理
+                # 文本文件处理：逐行流式读取，每行单独识别分隔符
                 with open(file_path, "r", encoding="utf-8") as f:
-                    lines = f.readlines()
-
-                for line in lines:
-                    line = line.strip()
-                    if line and not line.startswith("#"):
-                        # 支持多种格式
-                        if "," in line:
-                            parts = line.split(",", 1)
-                        elif "|" in line:
-                            parts = line.split("|", 1)
-                        elif "\t" in line:
-                            parts = line.split("\t", 1)
-                        elif " " in line:
-                            parts = line.split(" ", 1)
+                    for line in f:
+                        line = line.strip()
+                        if not line or line.startswith("#"):
+                            continue
+                        # 支持多种格式：按 逗号/竖线/制表符/空格 的优先级拆分
+                        for sep in ",|\t ":
+                            if sep in line:
+                                parts = line.split(sep, 1)
+                                break
                         else:
                             parts = [line, line]
 
-                        if len(parts) >= 2:
-                            code = parts[0].strip().zfill(6)
-                            name = parts[1].strip()
+                        code = parts[0].strip().zfill(6)
+                        name = parts[1].strip()
 
-                            if len(code) == 6 and code.isdigit() and name:
-                                if self.stock_pool.add_stock(code, name):
-                                    imported_count += 1
-                                else:
-                                    duplicate_count += 1
+                        if len(code) == 6 and code.isdigit() and name:
+                            if self.stock_pool.add_stock(code, name):
+                                imported_count += 1
+                            else:
+                                duplicate_count += 1
 
             # 显示结果
             message = f"导入完成！\n\n新增股票: {imported_count} 只\n重复股票: {duplicate_count} 只"
 
             if imported_count > 0:
                 self.log(f"✅ 成功导入 {imported_count} 只股票", "SUCCESS")
+                self._pool_dirty = True
                 self.refresh_stock_pool()  # 刷新界面
                 QMessageBox.information(self, "导入成功", message)
             else:
@@ -3237,111 +3895,191 @@ class MainWindow(QMainWindow):
 
         code, name = self.current_stock
 
-        # 获取历史数据
-        df = self.myquant_client.get_historical_data(code, self.current_period)
+        # 获取历史数据（缓存过期后只增量拉取最近K线）
+        bars = self.get_stock_data(code, self.current_period)
 
-        if not isinstance(df, pd.DataFrame) or df.empty:
+        if bars is None or len(bars) == 0:
             self.log(f"无法获取{code}的历史数据", "WARNING")
             return
 
-        # 缓存数据并绘制图表
-        self.data_cache[code] = df
-        self.update_chart_advanced(code, df)
+        self.update_chart_advanced(code, bars)
+
+    def _fetch_bars(self, code: str, period: str, cached):
+        """获取K线数据：已有缓存时只拉取最近几根K线并追加合并
+
+        数据无变化时原样返回缓存对象；增量数据与缓存不衔接（间隔过久）时全量重取。
+        """
+        if cached is not None and len(cached) > 0:
+            recent = self.myquant_client.get_historical_data(
+                code, period, count=self._INCREMENTAL_BARS
+            )
+            if isinstance(recent, pd.DataFrame) and not recent.empty:
+                recent = BarSeries.from_dataframe(
+                    recent.rename(columns=self._CHART_COLUMNS), period
+                )
+                if recent.ts[0] <= cached.ts[-1]:
+                    if recent.ts[-1] == cached.ts[-1] and cached.same_tail(recent):
+                        return cached  # 没有新K线，最后一根也未变化
+                    # 最后一根K线可能仍在变化，以新数据为准
+                    return cached.merge(recent, self._HISTORY_BARS)
+
+        # 全量获取；入缓存前统一列名（mplfinance 要求 Open/High/Low/Close/Volume）
+        df = self.myquant_client.get_historical_data(
+            code, period, count=self._HISTORY_BARS
+        )
+        if not isinstance(df, pd.DataFrame) or df.empty:
+            return None
+        return BarSeries.from_dataframe(df.rename(columns=self._CHART_COLUMNS), period)
 
     # ================================
     # 数据表格更新功能
     # ================================
 
-    def calculate_indicators(self, df: pd.DataFrame) -> dict:
-        """计算技术指标"""
-        if df.empty:
-            return {}
-
+    def _calculate_indicator_arrays(self, close, high=None, low=None) -> dict:
+        """由行情数组计算技术指标，返回与输入等长的 ndarray 字典"""
         indicators = {}
 
-        # 确保使用正确的列名
-        if "收盘" in df.columns:
-            close_col = "收盘"
-            high_col = "最高"
-            low_col = "最低"
-        else:
-            close_col = "Close"
-            high_col = "High"
-            low_col = "Low"
-
         try:
-            # 移动平均线
-            for period in [5, 10, 20, 60]:
-                ma_name = f"MA{period}"
-                if len(df) >= period:
-                    indicators[ma_name] = df[close_col].rolling(window=period).mean()
+            n = len(close)
 
-            # MACD指标
-            if len(df) >= 26:
-                exp1 = df[close_col].ewm(span=12).mean()
-                exp2 = df[close_col].ewm(span=26).mean()
-                macd_line = exp1 - exp2
-                signal_line = macd_line.ewm(span=9).mean()
-                histogram = macd_line - signal_line
+            # 移动平均线：各周期一次遍历同时计算
+            ma_values = _sma_multi(close, self._MA_PERIODS)
+            for col, period in enumerate(self._MA_PERIODS):
+                if n >= period:
+                    indicators[f"MA{period}"] = ma_values[:, col]
 
+            # MACD指标
+            if n >= 26:
+                ema_fast, ema_slow, macd_line, signal_line, histogram = _macd_loop(
+                    close, 12, 26, 9
+                )
+                indicators["EMA12"] = ema_fast
+                indicators["EMA26"] = ema_slow
                 indicators["MACD"] = macd_line
                 indicators["MACD_Signal"] = signal_line
                 indicators["MACD_Histogram"] = histogram
 
             # RSI指标
-            if len(df) >= 14:
-                delta = df[close_col].diff()
-                gain = (delta.where(delta > 0, 0)).rolling(window=14).mean()
-                loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
-                rs = gain / loss
-                indicators["RSI"] = 100 - (100 / (1 + rs))
+            if n >= 14:
+                indicators["RSI"] = _rsi_loop(close, 14)
 
             # KDJ指标
-            if len(df) >= 9 and high_col in df.columns and low_col in df.columns:
-                low_min = df[low_col].rolling(window=9).min()
-                high_max = df[high_col].rolling(window=9).max()
-                rsv = (df[close_col] - low_min) / (high_max - low_min) * 100
-
-                k = rsv.ewm(com=2).mean()
-                d = k.ewm(com=2).mean()
-                j = 3 * k - 2 * d
-
+            if n >= 9 and high is not None and low is not None:
+                k, d, j = _kdj_loop(high, low, close, 9, 2.0, 2.0)
                 indicators["KDJ_K"] = k
                 indicators["KDJ_D"] = d
                 indicators["KDJ_J"] = j
 
             # 布林带
-            if len(df) >= 20:
-                ma20 = df[close_col].rolling(window=20).mean()
-                std20 = df[close_col].rolling(window=20).std()
-
-                indicators["BOLL_UPPER"] = ma20 + 2 * std20
-                indicators["BOLL_MIDDLE"] = ma20
-                indicators["BOLL_LOWER"] = ma20 - 2 * std20
+            if n >= 20:
+                upper, middle, lower = _bb_loop(close, 20, 2.0)
+                indicators["BOLL_UPPER"] = upper
+                indicators["BOLL_MIDDLE"] = middle
+                indicators["BOLL_LOWER"] = lower
 
                 # 添加布林带宽度计算
-                indicators["BB_Width"] = (
-                    indicators["BOLL_UPPER"] - indicators["BOLL_LOWER"]
-                ) / indicators["BOLL_MIDDLE"]
+                indicators["BB_Width"] = (upper - lower) / middle
 
         except Exception as e:
             self.log(f"计算技术指标时出错: {e}", "WARNING")
 
         return indicators
 
+    def _get_indicators(self, bars: BarSeries) -> dict:
+        """获取技术指标：结果随 BarSeries 缓存，切换指标/缩放时不再重复计算
+
+        由旧数据追加新K线得到的 BarSeries 沿用旧指标，只计算新增部分。
+        """
+        if bars.indicators is None:
+            base, bars.base = bars.base, None
+            if base is not None and base[2] >= self._INCREMENTAL_WARMUP:
+                bars.indicators = self._extend_indicator_arrays(bars, *base)
+            if bars.indicators is None:
+                bars.indicators = self._calculate_indicator_arrays(
+                    bars.close, bars.high, bars.low
+                )
+        return bars.indicators
+
+    def _extend_indicator_arrays(
+        self, bars: BarSeries, prev: dict, kept: int, retained: int
+    ):
+        """在旧指标基础上只计算末尾新增K线
+
+        窗口类指标（MA/RSI/BOLL/RSV）按回看窗口精确计算；EMA 类（MACD/KDJ）
+        从上一根K线的值接续递推。旧指标不完整时返回 None，由调用方全量计算。
+        """
+        required = ("EMA12", "EMA26", "MACD_Signal", "RSI", "KDJ_K", "KDJ_D", "BB_Width")
+        if any(key not in prev for key in required):
+            return None
+
+        close, high, low = bars.close, bars.high, bars.low
+        old = slice(kept - retained, kept)  # 旧指标中被沿用的行
+        last = kept - 1  # 新增K线前一根在旧指标中的位置
+        new_close = close[retained:]
+        indicators = {}
+
+        def extend(key, tail):
+            indicators[key] = np.concatenate([prev[key][old], tail])
+
+        try:
+            # 移动平均线：回看最长周期
+            lookback = int(self._MA_PERIODS.max()) - 1
+            ma_values = _sma_multi(close[retained - lookback :], self._MA_PERIODS)
+            for col, period in enumerate(self._MA_PERIODS):
+                extend(f"MA{period}", ma_values[lookback:, col])
+
+            # MACD：EMA 接续递推
+            ema_fast = _ema_resume(new_close, 2.0 / 13, prev["EMA12"][last])
+            ema_slow = _ema_resume(new_close, 2.0 / 27, prev["EMA26"][last])
+            macd_line = ema_fast - ema_slow
+            signal_line = _ema_resume(macd_line, 2.0 / 10, prev["MACD_Signal"][last])
+            extend("EMA12", ema_fast)
+            extend("EMA26", ema_slow)
+            extend("MACD", macd_line)
+            extend("MACD_Signal", signal_line)
+            extend("MACD_Histogram", macd_line - signal_line)
+
+            # RSI：回看14根涨跌幅
+            extend("RSI", _rsi_loop(close[retained - 14 :], 14)[14:])
+
+            # KDJ：RSV 回看9根，K/D 接续递推
+            rsv = _rsv_loop(
+                high[retained - 8 :], low[retained - 8 :], close[retained - 8 :], 9
+            )[8:]
+            k = _ema_resume(rsv, 1.0 / 3, prev["KDJ_K"][last])
+            d = _ema_resume(k, 1.0 / 3, prev["KDJ_D"][last])
+            extend("KDJ_K", k)
+            extend("KDJ_D", d)
+            extend("KDJ_J", 3 * k - 2 * d)
+
+            # 布林带：回看20根
+            upper, middle, lower = _bb_loop(close[retained - 19 :], 20, 2.0)
+            extend("BOLL_UPPER", upper[19:])
+            extend("BOLL_MIDDLE", middle[19:])
+            extend("BOLL_LOWER", lower[19:])
+            extend("BB_Width", (upper[19:] - lower[19:]) / middle[19:])
+        except Exception as e:
+            self.log(f"增量计算技术指标出错，改为全量计算: {e}", "WARNING")
+            return None
+
+        return indicators
+
     def update_positions_table(self, positions: List[Dict]):
         """更新持仓表格"""
+        # 持仓变化会影响交易池状态列
+        self._pool_dirty = True
         self.position_table.setRowCount(len(positions))
 
+        fmt = self._fmt
         for i, pos in enumerate(positions):
             self.position_table.setItem(i, 0, QTableWidgetItem(pos.get("代码", "")))
             self.position_table.setItem(i, 1, QTableWidgetItem(pos.get("名称", "")))
             self.position_table.setItem(i, 2, QTableWidgetItem(str(pos.get("数量", 0))))
             self.position_table.setItem(
-                i, 3, QTableWidgetItem(f"{pos.get('成本价', 0):.2f}")
+                i, 3, QTableWidgetItem(fmt(pos.get("成本价", 0)))
             )
             self.position_table.setItem(
-                i, 4, QTableWidgetItem(f"{pos.get('现价', 0):.2f}")
+                i, 4, QTableWidgetItem(fmt(pos.get("现价", 0)))
             )
 
     def update_account_table(self, account: Dict):
@@ -3349,22 +4087,20 @@ class MainWindow(QMainWindow):
         # 检查数据来源
         is_from_client = account.get("总资产", 0) > 0
 
+        fmt = self._fmt
         items = [
-            f"{account.get('总资产', 0):.2f}",
-            f"{account.get('可用资金', 0):.2f}",
-            f"{account.get('持仓市值', 0):.2f}",
-            f"{account.get('当日盈亏', 0):.2f}",
+            fmt(account.get("总资产", 0)),
+            fmt(account.get("可用资金", 0)),
+            fmt(account.get("持仓市值", 0)),
+            fmt(account.get("当日盈亏", 0)),
         ]
 
         self.account_table.setRowCount(1)
+        # 如果是从客户端读取的数据，使用绿色字体表示
+        color = _COLOR_OK if is_from_client else _COLOR_WARN
         for i, value in enumerate(items):
             item_value = QTableWidgetItem(value)
-
-            # 如果是从客户端读取的数据，使用绿色字体表示
-            if is_from_client:
-                item_value.setForeground(QColor("green"))
-            else:
-                item_value.setForeground(QColor("orange"))
+            item_value.setForeground(color)
 
             self.account_table.setItem(0, i, item_value)
 
@@ -3446,161 +4182,99 @@ class MainWindow(QMainWindow):
 
     def update_trading_mode_buttons(self):
         """更新交易模式按钮样式"""
+        state = (self.simulation_button.isChecked(), self.real_trading_button.isChecked())
+        if state == self._last_mode_state:
+            return
+        self._last_mode_state = state
+        sim_on, real_on = state
+
         # 模拟交易模式按钮样式
-        if self.simulation_button.isChecked():
+        if sim_on:
             self.simulation_button.setText("● 模拟交易模式")
-            self.simulation_button.setStyleSheet(
-                "QPushButton { color: #2196F3; font-weight: bold; background-color: transparent; border: none; }"
-            )
+            self.simulation_button.setStyleSheet(self._SIM_ON_STYLE)
         else:
             self.simulation_button.setText("○ 模拟交易模式")
-            self.simulation_button.setStyleSheet(
-                "QPushButton { color: gray; background-color: transparent; border: none; }"
-            )
+            self.simulation_button.setStyleSheet(self._MODE_OFF_STYLE)
 
         # 实盘交易模式按钮样式
-        if self.real_trading_button.isChecked():
+        if real_on:
             self.real_trading_button.setText("● 实盘交易模式")
-            self.real_trading_button.setStyleSheet(
-                "QPushButton { color: #FF5722; font-weight: bold; background-color: transparent; border: none; }"
-            )
+            self.real_trading_button.setStyleSheet(self._REAL_ON_STYLE)
         else:
             self.real_trading_button.setText("○ 实盘交易模式")
-            self.real_trading_button.setStyleSheet(
-                "QPushButton { color: gray; background-color: transparent; border: none; }"
-            )
+            self.real_trading_button.setStyleSheet(self._MODE_OFF_STYLE)
 
     # ================================
     # F. 同步客户端功能
     # ================================
 
     def sync_client_data(self):
-        """同步客户端数据"""
-        self.log("开始同步客户端数据...", "INFO")
+        """同步客户端数据（持仓/账户在后台线程并发获取，完成后刷新交易池）"""
+        if self.sync_thread is not None and self.sync_thread.isRunning():
+            self.log("客户端数据同步进行中，请稍候...", "INFO")
+            return
 
+        self.log("开始同步客户端数据...", "INFO")
+        self.sync_client_button.setEnabled(False)
+        self.sync_thread = SyncDataThread(self.myquant_client, self.signals)
+        self.sync_thread.sync_finished.connect(self.on_sync_finished)
+        self.sync_thread.sync_failed.connect(self.on_sync_failed)
+        self.sync_thread.start()
+
+    def on_sync_failed(self, message: str):
+        """客户端数据同步失败回调"""
+        self.sync_client_button.setEnabled(True)
+        QMessageBox.warning(self, "同步失败", message)
+
+    def on_sync_finished(self, sync_success_count: int):
+        """客户端数据同步完成回调：刷新交易池并显示同步结果"""
+        self.sync_client_button.setEnabled(True)
+        sync_total_count = 3  # 持仓、账户、交易池
+
+        # 3. 刷新交易池数据（涉及界面更新，在主线程执行）
+        self.log("正在刷新交易池数据...", "INFO")
         try:
-            # 检查客户端连接状态
-            if not self.myquant_client.is_connected():
-                self.log("客户端未连接，正在尝试重新连接...", "WARNING")
-                if not self.myquant_client.connect():
-                    self.log("客户端连接失败，无法同步数据", "ERROR")
-                    QMessageBox.warning(self, "同步失败", "客户端连接失败，请检查配置")
-                    return
-            else:
-                self.log("客户端连接正常", "INFO")
-
-            # 统计同步结果
-            sync_success_count = 0
-            sync_total_count = 3  # 持仓、账户、交易池
+            self._pool_dirty = True
+            self.refresh_stock_pool()
+            self.log("✅ 交易池数据刷新成功", "SUCCESS")
+            sync_success_count += 1
+        except Exception as e:
+            self.log(f"❌ 交易池数据刷新失败: {str(e)}", "ERROR")
+
+        # 显示同步结果
+        if sync_success_count == sync_total_count:
+            result_msg = "🎉 客户端数据同步完全成功！"
+            self.log(result_msg, "SUCCESS")
+            QMessageBox.information(self, "同步成功", result_msg)
+        elif sync_success_count > 0:
+            result_msg = (
+                f"⚠️  部分数据同步成功 ({sync_success_count}/{sync_total_count})\n\n"
+                "如果持仓和账户信息显示为空，这通常是因为：\n"
+                "1. MyQuant账户未开通交易权限\n"
+                "2. 账户配置不完整\n"
+                "3. 当前为演示模式\n\n"
+                "交易池数据和行情功能不受影响。"
+            )
+            self.log("客户端数据部分同步完成", "INFO")
+            QMessageBox.information(self, "同步完成", result_msg)
+        else:
+            result_msg = "❌ 数据同步失败\n\n请检查网络连接和MyQuant配置"
+            self.log("客户端数据同步失败", "ERROR")
+            QMessageBox.warning(self, "同步失败", result_msg)
 
-            # 1. 同步持仓信息
-            self.log("正在同步持仓信息...", "INFO")
-            try:
-                positions = self.myquant_client.get_positions()
-                if positions and len(positions) > 0:
-                    self.signals.positions_updated.emit(positions)
-                    self.log(
-                        f"✅ 同步持仓信息成功，共{len(positions)}只股票", "SUCCESS"
-                    )
-                    sync_success_count += 1
-                else:
-                    # 空持仓也算成功
-                    self.signals.positions_updated.emit([])
-                    self.log("✅ 持仓为空，已清空持仓表格", "INFO")
-                    sync_success_count += 1
-            except Exception as e:
-                error_msg = str(e)
-                if "无效的ACCOUNT_ID" in error_msg or "1020" in error_msg:
-                    self.log("⚠️  持仓信息获取失败：账户权限不足或配置问题", "WARNING")
-                    self.log("   可能需要在MyQuant平台开通相应权限", "INFO")
-                else:
-                    self.log(f"❌ 持仓信息获取失败: {error_msg}", "ERROR")
-                # 设置空持仓
-                self.signals.positions_updated.emit([])
+    # ================================
+    # 交易记录功能
+    # ================================
 
-            # 2. 同步账户信息
-            self.log("正在同步账户信息...", "INFO")
-            try:
-                account = self.myquant_client.get_account_info()
-                if account and any(v != 0 for v in account.values()):
-                    self.signals.account_updated.emit(account)
-                    self.log("✅ 同步账户信息成功", "SUCCESS")
-                    sync_success_count += 1
-                else:
-                    # 显示默认的零账户信息
-                    default_account = {
-                        "总资产": 0,
-                        "可用资金": 0,
-                        "持仓市值": 0,
-                        "当日盈亏": 0,
-                    }
-                    self.signals.account_updated.emit(default_account)
-                    self.log("⚠️  账户信息为空或全为零", "WARNING")
-            except Exception as e:
-                error_msg = str(e)
-                if "无效的ACCOUNT_ID" in error_msg or "1020" in error_msg:
-                    self.log("⚠️  账户信息获取失败：账户权限不足或配置问题", "WARNING")
-                    self.log("   可能需要在MyQuant平台开通交易权限", "INFO")
-                else:
-                    self.log(f"❌ 账户信息获取失败: {error_msg}", "ERROR")
-
-                # 显示默认账户信息
-                default_account = {
-                    "总资产": 0,
-                    "可用资金": 0,
-                    "持仓市值": 0,
-                    "当日盈亏": 0,
-                }
-                self.signals.account_updated.emit(default_account)
-
-            # 3. 刷新交易池数据
-            self.log("正在刷新交易池数据...", "INFO")
-            try:
-                self.refresh_stock_pool()
-                self.log("✅ 交易池数据刷新成功", "SUCCESS")
-                sync_success_count += 1
-            except Exception as e:
-                self.log(f"❌ 交易池数据刷新失败: {str(e)}", "ERROR")
-
-            # 显示同步结果
-            if sync_success_count == sync_total_count:
-                result_msg = "🎉 客户端数据同步完全成功！"
-                self.log(result_msg, "SUCCESS")
-                QMessageBox.information(self, "同步成功", result_msg)
-            elif sync_success_count > 0:
-                result_msg = (
-                    f"⚠️  部分数据同步成功 ({sync_success_count}/{sync_total_count})\n\n"
-                    "如果持仓和账户信息显示为空，这通常是因为：\n"
-                    "1. MyQuant账户未开通交易权限\n"
-                    "2. 账户配置不完整\n"
-                    "3. 当前为演示模式\n\n"
-                    "交易池数据和行情功能不受影响。"
-                )
-                self.log("客户端数据部分同步完成", "INFO")
-                QMessageBox.information(self, "同步完成", result_msg)
-            else:
-                result_msg = "❌ 数据同步失败\n\n请检查网络连接和MyQuant配置"
-                self.log("客户端数据同步失败", "ERROR")
-                QMessageBox.warning(self, "同步失败", result_msg)
-
-        except Exception as e:
-            error_msg = f"同步客户端数据异常: {str(e)}"
-            self.log(error_msg, "ERROR")
-            QMessageBox.critical(self, "同步异常", f"发生未预期的错误：\n{str(e)}")
-
-    # ================================
-    # 交易记录功能
-    # ================================
-
-    def show_trade_records(self):
-        """显示交易记录"""
-        # 在展示对话框前从磁盘重新加载，保证跨进程写入也能被看到
-        try:
-            self.trade_recorder.load_records()
-        except Exception as e:
-            self.log(f"重新加载交易记录失败: {e}", "ERROR")
-        dialog = TradeRecordsDialog(self.trade_recorder, parent=self)
-        dialog.exec_()
+    def show_trade_records(self):
+        """显示交易记录"""
+        # 在展示对话框前从磁盘重新加载，保证跨进程写入也能被看到
+        try:
+            self.trade_recorder.load_records()
+        except Exception as e:
+            self.log(f"重新加载交易记录失败: {e}", "ERROR")
+        dialog = TradeRecordsDialog(self.trade_recorder, parent=self)
+        dialog.exec_()
 
     # ================================
     # 图表更新和指标计算功能
@@ -3609,25 +4283,82 @@ class MainWindow(QMainWindow):
     def on_indicator_change(self):
         """主图指标改变"""
         self.current_indicator = self.indicator_combo.currentText()
-        self.redraw_chart()
+        if self._chart_is_current():
+            # K线未变化，只切换均线叠加层并局部重绘（blit）
+            self._update_overlays_only(self._chart_state["indicators"])
+            self._blit_overlays()
+        else:
+            self.redraw_chart()
 
     def on_subplot_indicator_change(self):
         """副图指标改变"""
         self.current_subplot_indicator = self.subplot_indicator_combo.currentText()
-        self.redraw_chart()
+        if self._chart_is_current():
+            # 只重绘副图，主图K线和成交量保持不动
+            state = self._chart_state
+            self.draw_subplot_indicator(state["df_plot"], state["indicators"])
+            self.ax_indicator.grid(True, alpha=0.3, linestyle="--")
+            self.canvas.draw_idle()
+        else:
+            self.redraw_chart()
+
+    def _chart_is_current(self) -> bool:
+        """当前图表是否仍对应选中股票的缓存数据"""
+        state = self._chart_state
+        if not state or not self.current_stock:
+            return False
+        code = self.current_stock[0]
+        return state["code"] == code and state["source"] is self.data_cache.get(
+            code, self.current_period
+        )
+
+    def _x_range(self, count: int) -> np.ndarray:
+        """返回 0..count-1 的横轴序号（预分配数组的切片视图）"""
+        if count > len(self._x_cache):
+            self._x_cache = np.arange(count)
+        return self._x_cache[:count]
+
+    def _on_canvas_draw(self, event):
+        """整图重绘后缓存主图背景（不含均线），并补画均线叠加层"""
+        if not self._ma_lines:
+            self._bg_price = None
+            return
+        self._bg_price = self.canvas.copy_from_bbox(self.ax_price.bbox)
+        for line in self._ma_lines.values():
+            self.ax_price.draw_artist(line)
+
+    def _blit_overlays(self):
+        """恢复主图背景后只重画均线，避免整图重新栅格化"""
+        if self._bg_price is None:
+            self.canvas.draw_idle()
+            return
+        self.canvas.restore_region(self._bg_price)
+        for line in self._ma_lines.values():
+            self.ax_price.draw_artist(line)
+        self.canvas.blit(self.ax_price.bbox)
+
+    def _update_overlays_only(self, indicators: dict):
+        """仅更新主图均线叠加层（数据与可见性），不重绘K线"""
+        count = len(self._chart_state["df_plot"])
+        show_all = self.current_indicator == "均线"
+        for ma_name, line in self._ma_lines.items():
+            line.set_ydata(indicators[ma_name][-count:])
+            # 均线：MA5/MA20/MA60 全部显示；操盘线：仅MA60
+            line.set_visible(show_all or ma_name == "MA60")
+            line.set_linewidth(1.2 if show_all else 1.3)
 
     def redraw_chart(self):
         """重绘图表"""
         if not self.current_stock:
             return
         code, name = self.current_stock
-        df = self.data_cache.get(code)
-        if isinstance(df, pd.DataFrame) and not df.empty:
-            self.update_chart_advanced(code, df)
+        bars = self.data_cache.get(code, self.current_period)
+        if bars is not None and len(bars) > 0:
+            self.update_chart_advanced(code, bars)
 
-    def update_chart_advanced(self, code: str, df: pd.DataFrame):
+    def update_chart_advanced(self, code: str, bars: BarSeries):
         """更新图表显示"""
-        if not isinstance(df, pd.DataFrame) or df.empty:
+        if bars is None or len(bars) == 0:
             self.log("❌ 无法绘制图表，数据为空", "WARNING")
             return
 
@@ -3635,45 +4366,21 @@ class MainWindow(QMainWindow):
         self.ax_vol.set_visible(True)
         self.ax_indicator.set_visible(True)
 
-        # 缓存全量数据，绘图用尾部数据
-        self.data_cache[code] = df
-        df_plot = df.tail(self.zoom_level).copy()
-
-        # 标准化列名 - 确保mplfinance兼容性
-        column_mapping = {
-            "开盘": "Open",
-            "最高": "High",
-            "最低": "Low",
-            "收盘": "Close",
-            "成交量": "Volume",
-            "成交额": "Amount",
-            "open": "Open",
-            "high": "High",
-            "low": "Low",
-            "close": "Close",
-            "volume": "Volume",
-            "amount": "Amount",
-        }
-
-        # 重命名列名以符合mplfinance要求
-        df_plot = df_plot.rename(columns=column_mapping)
-
-        # 确保必需的列存在
-        required_cols = ["Open", "High", "Low", "Close"]
-        missing_cols = [col for col in required_cols if col not in df_plot.columns]
-        if missing_cols:
-            self.log(
-                f"❌ 数据缺少必需列: {missing_cols}, 现有列: {list(df_plot.columns)}",
-                "ERROR",
-            )
-            return
+        # 只为显示的尾部K线构建 mplfinance 所需的 DataFrame
+        df_plot = bars.as_dataframe(self.zoom_level)
 
-        # 计算技术指标
-        indicators = self.calculate_indicators(df)
+        # 计算技术指标（数据未变时直接复用缓存）
+        indicators = self._get_indicators(bars)
 
-        # 运行交易策略信号检测
-        signal_engine = SignalEngine()
-        signal_engine.run_all_strategies(df, indicators, code)
+        # 运行交易策略信号检测：只在数据或周期变化时检测，缩放/切换指标时复用结果
+        signal_engine = self.signal_engine
+        signal_stamp = (code, self.current_period) + bars.stamp
+        show_signals = self.config.get("display.show_signals", False)
+        if show_signals and signal_stamp != self._signal_stamp:
+            # 策略只用到收盘价，直接传列数组，无需构建整表 DataFrame
+            signal_engine.run_all_strategies({"Close": bars.close}, indicators, code)
+            self._last_signal_results = list(signal_engine.results)
+            self._signal_stamp = signal_stamp
 
         # 清空三个子图
         self.ax_price.clear()
@@ -3693,58 +4400,6 @@ class MainWindow(QMainWindow):
         title_text = f"{code} {name} - {period_str}"
         self.ax_price.set_title(title_text, fontsize=14, fontweight="bold", pad=10)
 
-        # 配置图表样式
-        mc = mpf.make_marketcolors(
-            up=self.chart_colors["up"],
-            down=self.chart_colors["down"],
-            edge={"up": self.chart_colors["up"], "down": self.chart_colors["down"]},
-            wick={"up": self.chart_colors["up"], "down": self.chart_colors["down"]},
-            volume={"up": self.chart_colors["up"], "down": self.chart_colors["down"]},
-        )
-
-        s = mpf.make_mpf_style(
-            base_mpf_style="yahoo",
-            marketcolors=mc,
-            rc={
-                "font.family": "SimHei",
-                "axes.edgecolor": "#CCCCCC",
-                "axes.labelcolor": self.chart_colors["text"],
-                "xtick.color": self.chart_colors["text"],
-                "ytick.color": self.chart_colors["text"],
-                "figure.facecolor": self.chart_colors["bg"],
-                "axes.facecolor": self.chart_colors["ax"],
-                "grid.color": self.chart_colors["grid"],
-                "grid.linestyle": "--",
-            },
-        )
-
-        # 根据指标选择绘制均线
-        add_plot = []
-        if self.current_indicator == "均线":
-            for ma_name, color in [
-                ("MA5", self.chart_colors["ma5"]),
-                ("MA20", self.chart_colors["ma20"]),
-                ("MA60", self.chart_colors["ma60"]),
-            ]:
-                if ma_name in indicators:
-                    ma_data = indicators[ma_name].tail(len(df_plot))
-                    add_plot.append(
-                        mpf.make_addplot(
-                            ma_data, ax=self.ax_price, color=color, width=1.2
-                        )
-                    )
-        else:  # 操盘线：仅MA60
-            if "MA60" in indicators:
-                ma60_data = indicators["MA60"].tail(len(df_plot))
-                add_plot.append(
-                    mpf.make_addplot(
-                        ma60_data,
-                        ax=self.ax_price,
-                        color=self.chart_colors["ma60"],
-                        width=1.3,
-                    )
-                )
-
         # 绘制K线图和成交量
         try:
             mpf.plot(
@@ -3752,8 +4407,7 @@ class MainWindow(QMainWindow):
                 ax=self.ax_price,
                 volume=self.ax_vol,
                 type="candle",
-                style=s,
-                addplot=add_plot if add_plot else None,
+                style=self._mpf_style,
                 xrotation=0,
                 tight_layout=False,
                 warn_too_much_data=df_plot.shape[0] + 1,
@@ -3762,6 +4416,31 @@ class MainWindow(QMainWindow):
             self.log(f"绘制K线图失败: {e}", "ERROR")
             return
 
+        # 绘制均线叠加层：保存线条句柄，切换主图指标时只更新线条不重绘K线
+        self._chart_state = {
+            "code": code,
+            "source": bars,
+            "df_plot": df_plot,
+            "indicators": indicators,
+        }
+        x_range = self._x_range(len(df_plot))
+        self._ma_lines = {}
+        for ma_name, color in [
+            ("MA5", self.chart_colors["ma5"]),
+            ("MA20", self.chart_colors["ma20"]),
+            ("MA60", self.chart_colors["ma60"]),
+        ]:
+            if ma_name in indicators:
+                (line,) = self.ax_price.plot(
+                    x_range,
+                    indicators[ma_name][-len(df_plot) :],
+                    color=color,
+                    linewidth=1.2,
+                    animated=True,  # 不参与整图绘制，由 blit 单独重画
+                )
+                self._ma_lines[ma_name] = line
+        self._update_overlays_only(indicators)
+
         # 设置成交量轴标签
         self.ax_vol.set_ylabel("成交量", color=self.chart_colors["text"], fontsize=9)
 
@@ -3773,10 +4452,8 @@ class MainWindow(QMainWindow):
             ax.grid(True, alpha=0.3, linestyle="--")
 
         # 设置日期轴格式，只在最下方的指标图显示日期
-        import matplotlib.dates as mdates
-
-        locator = mdates.AutoDateLocator(minticks=6, maxticks=10)
-        formatter = mdates.AutoDateFormatter(locator)
+        locator = self._date_locator
+        formatter = self._date_formatter
 
         # 给所有图设置统一的日期格式
         for ax in [self.ax_price, self.ax_vol, self.ax_indicator]:
@@ -3788,17 +4465,18 @@ class MainWindow(QMainWindow):
         self.ax_vol.tick_params(axis="x", labelbottom=False)
 
         # 显示交易信号
-        if signal_engine.results:
-            latest_signal = signal_engine.results[-1]  # 最新信号
+        if show_signals and self._last_signal_results:
+            latest_signal = self._last_signal_results[-1]  # 最新信号
             signal_name, signal_score = latest_signal[1], latest_signal[3]
             signal_text = signal_engine.label_map.get(signal_name, (signal_name, 0))[0]
 
-            last_close = float(df_plot["close"].iloc[-1])
-            last_dt = df_plot.index[-1]
+            # mplfinance 横轴为K线序号，标注位置取最后一根K线
+            last_close = float(df_plot["Close"].iloc[-1])
+            last_x = len(df_plot) - 1
 
             self.ax_price.annotate(
                 signal_text,
-                xy=(last_dt, last_close),
+                xy=(last_x, last_close),
                 xytext=(0, -30),
                 textcoords="offset points",
                 ha="center",
@@ -3835,6 +4513,11 @@ class MainWindow(QMainWindow):
             if not isinstance(indicators, dict) or len(indicators) == 0:
                 raise ValueError("指标数据字典为空或无效")
 
+            # 指标内核输出即为浮点数组；仅非浮点数据在此统一转换一次
+            for key, values in indicators.items():
+                if values.dtype.kind != "f":
+                    indicators[key] = values.astype(np.float64)
+
             if self.current_subplot_indicator == "MACD":
                 self.draw_macd_indicator(df_plot, indicators)
             elif self.current_subplot_indicator == "RSI":
@@ -3883,12 +4566,13 @@ class MainWindow(QMainWindow):
 
             if all(k in indicators for k in required_keys):
                 # 获取与df_plot对应的指标数据
-                macd_data = indicators["MACD"].tail(len(df_plot))
-                signal_data = indicators["MACD_Signal"].tail(len(df_plot))
-                hist_data = indicators["MACD_Histogram"].tail(len(df_plot))
+                n = len(df_plot)
+                macd_data = indicators["MACD"][-n:]
+                signal_data = indicators["MACD_Signal"][-n:]
+                hist_data = indicators["MACD_Histogram"][-n:]
 
                 # 检查数据是否有有效值
-                if macd_data.isna().all():
+                if np.isnan(macd_data).all():
                     self.ax_indicator.text(
                         0.5,
                         0.5,
@@ -3900,23 +4584,20 @@ class MainWindow(QMainWindow):
                     )
                     return
 
-                # 确保数据类型正确
-                macd_data = pd.to_numeric(macd_data, errors="coerce")
-                signal_data = pd.to_numeric(signal_data, errors="coerce")
-                hist_data = pd.to_numeric(hist_data, errors="coerce")
-
-                # MACD柱状图颜色
-                hist_colors = [
-                    self.chart_colors["up"] if v >= 0 else self.chart_colors["down"]
-                    for v in hist_data.fillna(0)
-                ]
+                # MACD柱状图颜色（向量化按正负取色）
+                hist_values = np.where(np.isnan(hist_data), 0.0, hist_data)
+                hist_colors = np.where(
+                    hist_values >= 0,
+                    self.chart_colors["up"],
+                    self.chart_colors["down"],
+                ).tolist()
 
                 # 使用索引范围作为横轴（参考st_juej_v100.py的成功做法）
-                x_range = range(len(df_plot))
+                x_range = self._x_range(len(df_plot))
                 # 绘制柱状图
                 self.ax_indicator.bar(
                     x_range,
-                    hist_data.fillna(0),
+                    hist_values,
                     color=hist_colors,
                     width=0.8,
                     alpha=0.6,
@@ -3960,9 +4641,9 @@ class MainWindow(QMainWindow):
         """绘制RSI指标"""
         try:
             if "RSI" in indicators:
-                rsi_data = indicators["RSI"].tail(len(df_plot))
+                rsi_data = indicators["RSI"][-len(df_plot) :]
 
-                if rsi_data.isna().all():
+                if np.isnan(rsi_data).all():
                     self.ax_indicator.text(
                         0.5,
                         0.5,
@@ -3974,10 +4655,8 @@ class MainWindow(QMainWindow):
                     )
                     return
 
-                rsi_data = pd.to_numeric(rsi_data, errors="coerce")
-
                 # 使用索引范围作为横轴（参考st_juej_v100.py的成功做法）
-                x_range = range(len(df_plot))
+                x_range = self._x_range(len(df_plot))
 
                 self.ax_indicator.plot(
                     x_range, rsi_data, color="#9C27B0", linewidth=1.2, label="RSI"
@@ -4012,11 +4691,12 @@ class MainWindow(QMainWindow):
             required_keys = ["KDJ_K", "KDJ_D", "KDJ_J"]
 
             if all(k in indicators for k in required_keys):
-                k_data = indicators["KDJ_K"].tail(len(df_plot))
-                d_data = indicators["KDJ_D"].tail(len(df_plot))
-                j_data = indicators["KDJ_J"].tail(len(df_plot))
+                n = len(df_plot)
+                k_data = indicators["KDJ_K"][-n:]
+                d_data = indicators["KDJ_D"][-n:]
+                j_data = indicators["KDJ_J"][-n:]
 
-                if k_data.isna().all():
+                if np.isnan(k_data).all():
                     self.ax_indicator.text(
                         0.5,
                         0.5,
@@ -4028,12 +4708,8 @@ class MainWindow(QMainWindow):
                     )
                     return
 
-                k_data = pd.to_numeric(k_data, errors="coerce")
-                d_data = pd.to_numeric(d_data, errors="coerce")
-                j_data = pd.to_numeric(j_data, errors="coerce")
-
                 # 使用索引范围作为横轴（参考st_juej_v100.py的成功做法）
-                x_range = range(len(df_plot))
+                x_range = self._x_range(len(df_plot))
 
                 self.ax_indicator.plot(
                     x_range, k_data, color="#2196F3", linewidth=1.2, label="K"
@@ -4085,10 +4761,10 @@ class MainWindow(QMainWindow):
             )
             return
 
-        bb_width_data = indicators["BB_Width"].tail(len(df_plot)) * 100  # 转为百分比
+        bb_width_data = indicators["BB_Width"][-len(df_plot) :] * 100  # 转为百分比
 
         # 使用索引范围作为横轴（参考st_juej_v100.py的成功做法）
-        x_range = range(len(df_plot))
+        x_range = self._x_range(len(df_plot))
 
         self.ax_indicator.plot(
             x_range, bb_width_data, color="#795548", linewidth=1.2, label="BOLL Width %"
@@ -4102,6 +4778,10 @@ class MainWindow(QMainWindow):
     # 图表缩放控制功能
     # ================================
 
+    def _schedule_redraw(self):
+        """延迟重绘图表（重新计时），合并连续的缩放操作"""
+        self._redraw_timer.start()
+
     def zoom_in(self):
         """放大图表 - 减少显示数据量"""
         old_zoom = self.zoom_level
@@ -4109,7 +4789,7 @@ class MainWindow(QMainWindow):
         if self.zoom_level != old_zoom:
             self.zoom_label.setText(f"{self.zoom_level}K")
             if hasattr(self, "current_stock") and self.current_stock:
-                self.update_chart()
+                self._schedule_redraw()
             self.log(f"📈 放大图表，显示最近{self.zoom_level}根K线", "INFO")
 
     def zoom_out(self):
@@ -4119,7 +4799,7 @@ class MainWindow(QMainWindow):
         if self.zoom_level != old_zoom:
             self.zoom_label.setText(f"{self.zoom_level}K")
             if hasattr(self, "current_stock") and self.current_stock:
-                self.update_chart()
+                self._schedule_redraw()
             self.log(f"📉 缩小图表，显示最近{self.zoom_level}根K线", "INFO")
 
     def reset_zoom(self):
@@ -4127,48 +4807,35 @@ class MainWindow(QMainWindow):
         self.zoom_level = 120
         self.zoom_label.setText(f"{self.zoom_level}K")
         if hasattr(self, "current_stock") and self.current_stock:
-            self.update_chart()
+            self._schedule_redraw()
         self.log(f"🔄 重置图表缩放，显示最近{self.zoom_level}根K线", "INFO")
 
     # ================================
     # 数据获取和处理功能
     # ================================
 
-    def get_stock_data(self, code: str, period: str = "1d") -> pd.DataFrame:
-        """获取股票数据"""
+    def get_stock_data(self, code: str, period: str = "1d"):
+        """获取股票K线数据（BarSeries），缓存过期后增量更新"""
         try:
-            # 检查缓存
-            cache_key = f"{code}_{period}"
-            if cache_key in self.data_cache:
-                cached_data = self.data_cache[cache_key]
-                if isinstance(cached_data, pd.DataFrame) and not cached_data.empty:
-                    # 检查缓存时效（日内数据5分钟更新，日线数据30分钟更新）
-                    now = datetime.now()
-                    cache_timeout = 5 if period in ["1m", "5m", "15m", "60m"] else 30
-                    last_update = getattr(
-                        cached_data,
-                        "_last_update",
-                        now - timedelta(minutes=cache_timeout + 1),
-                    )
-
-                    if (now - last_update).total_seconds() < cache_timeout * 60:
-                        return cached_data
-
-            # 从MyQuant获取数据
-            if self.myquant and self.myquant.is_connected():
-                df = self.myquant.get_bars(code, period, count=500)
-                if isinstance(df, pd.DataFrame) and not df.empty:
-                    df._last_update = datetime.now()
-                    self.data_cache[cache_key] = df
-                    return df
-
-            # 备用：使用mock数据
-            self.log(f"⚠️ 使用模拟数据为{code}", "WARNING")
-            return self.generate_mock_data()
+            # 检查缓存时效（日内数据30秒，日线数据5分钟），期间缩放/重绘直接复用
+            cached = self.data_cache.get(code, period)
+            if cached is not None:
+                cache_timeout = 30 if period in self._INTRADAY else 300
+                if time.monotonic() - cached.last_update < cache_timeout:
+                    return cached
+
+            bars = self._fetch_bars(code, period, cached)
+            if bars is None:
+                return None
+
+            bars.last_update = time.monotonic()
+            if bars is not cached:
+                self.data_cache.put(code, period, bars)
+            return bars
 
         except Exception as e:
             self.log(f"❌ 获取{code}数据失败: {e}", "ERROR")
-            return pd.DataFrame()
+            return None
 
     # ...已移除测试用模拟K线数据生成函数...
 
@@ -4195,12 +4862,197 @@ class MainWindow(QMainWindow):
 # ================================
 
 
+# 对话框样式表（模块级常量，各对话框共用同一字符串）
+_STYLE_PERM_TITLE = """
+QLabel {
+    font-size: 16pt;
+    font-weight: bold;
+    color: #333;
+    padding: 15px;
+    background-color: #f8f9fa;
+    border-radius: 8px;
+    margin-bottom: 10px;
+}
+"""
+_STYLE_INFO_BANNER = """
+QLabel {
+    background-color: #e8f4fd;
+    padding: 15px;
+    border-radius: 8px;
+    border-left: 4px solid #2196f3;
+    font-size: 9pt;
+    line-height: 1.4;
+}
+"""
+_STYLE_RESULT_BOX = """
+QLabel {
+    padding: 10px;
+    background-color: #f8f9fa;
+    border-radius: 5px;
+    border: 1px solid #dee2e6;
+}
+"""
+_STYLE_LOADING_OVERLAY = "background: rgba(255,255,255,0.8);"
+_STYLE_HINT_SMALL = "color: #666; font-size: 10px;"
+_STYLE_DIALOG_TITLE = """
+QLabel {
+    font-size: 14pt;
+    font-weight: bold;
+    color: #333;
+    padding: 10px;
+}
+"""
+_STYLE_SOURCE_OK = """
+QLabel {
+    background-color: #e8f5e8;
+    padding: 5px 10px;
+    border-radius: 4px;
+    border-left: 3px solid #4caf50;
+    font-size: 9pt;
+}
+"""
+_STYLE_BLUE_BTN = """
+QPushButton {
+    background-color: #2196f3;
+    color: white;
+    border: none;
+    padding: 5px 10px;
+    border-radius: 4px;
+    font-size: 9pt;
+}
+QPushButton:hover {
+    background-color: #1976d2;
+}
+"""
+_STYLE_TIP = "color: #666; font-size: 9pt; padding: 5px;"
+_STYLE_SECTION_TITLE = "font-weight: bold; color: #333; padding: 5px;"
+_STYLE_SEARCH_DESC = (
+    "color: #666; font-size: 9pt; padding: 5px; "
+    "background-color: #f8f9fa; border-radius: 4px;"
+)
+_STYLE_GREEN_BTN = """
+QPushButton {
+    background-color: #4CAF50;
+    color: white;
+    border: none;
+    padding: 8px 16px;
+    border-radius: 4px;
+    font-weight: bold;
+}
+QPushButton:hover {
+    background-color: #45a049;
+}
+QPushButton:disabled {
+    background-color: #cccccc;
+    color: #666666;
+}
+"""
+_STYLE_SOURCE_STALE = """
+QLabel {
+    background-color: #fff3e0;
+    padding: 5px 10px;
+    border-radius: 4px;
+    border-left: 3px solid #ff9800;
+    font-size: 9pt;
+}
+"""
+_STYLE_AMOUNT_IDLE = "color: #666; font-weight: bold;"
+_STYLE_AMOUNT_GREEN = "color: #4caf50; font-weight: bold;"
+_STYLE_AMOUNT_ORANGE = "color: #ff9800; font-weight: bold;"
+_STYLE_AMOUNT_RED = "color: #f44336; font-weight: bold;"
+# 预估金额分档：<=1万绿色，<=5万橙色，>5万红色（bisect_left 取档位）
+_AMOUNT_THRESHOLDS = (10000, 50000)
+_STYLE_AMOUNT = (_STYLE_AMOUNT_GREEN, _STYLE_AMOUNT_ORANGE, _STYLE_AMOUNT_RED)
+
+# 表格前景色（共享画刷，避免逐行解析颜色字符串；权限表、交易池、账户表共用）
+_COLOR_OK = QBrush(QColor("green"))
+_COLOR_BAD = QBrush(QColor("red"))
+_COLOR_INFO = QBrush(QColor("blue"))
+_COLOR_WARN = QBrush(QColor("orange"))
+
+# 粘贴股票代码时去掉的交易所前后缀：SHSE.600000 / SH600000 / 600000.SH 等
+_CODE_AFFIX_RE = re.compile(
+    r"^(?:SHSE|SZSE|BJSE|SH|SZ|BJ)\.?|\.?(?:SHSE|SZSE|SH|SZ|SS|BJ)$", re.IGNORECASE
+)
+
+
+class StockCodeValidator(QValidator):
+    """股票代码输入校验：只接受最多6位数字，粘贴的带交易所前后缀代码自动去掉前后缀"""
+
+    def validate(self, text, pos):
+        code = _CODE_AFFIX_RE.sub("", text.strip())
+        if len(code) > 6 or (code and not code.isdigit()):
+            return QValidator.Invalid, text, pos
+        if code != text:
+            pos = len(code)
+        state = QValidator.Acceptable if len(code) == 6 else QValidator.Intermediate
+        return state, code, pos
+
+
+class PermissionsModel(QAbstractTableModel):
+    """交易权限表格模型：行数据在插入时格式化，data() 只做查表"""
+
+    HEADERS = ("权限类型", "状态", "说明")
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._rows = []  # [(权限类型, 状态文本, 状态画刷, 说明)]
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else 3
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.HEADERS[section]
+        return None
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        row = self._rows[index.row()]
+        column = index.column()
+        if role == Qt.DisplayRole:
+            return row[(0, 1, 3)[column]]
+        if role == Qt.ForegroundRole and column == 1:
+            return row[2]
+        return None
+
+    @staticmethod
+    def _format_row(permission_type, status, description):
+        """格式化一行：布尔状态转为有/无权限文本和对应画刷"""
+        if isinstance(status, bool):
+            status_text = "✅ 有权限" if status else "❌ 无权限"
+            brush = _COLOR_OK if status else _COLOR_BAD
+        else:
+            status_text = str(status)
+            brush = _COLOR_INFO
+        return (permission_type, status_text, brush, description)
+
+    def set_rows(self, rows):
+        """一次性替换全部行 [(权限类型, 状态, 说明)]，只触发一次重置"""
+        self.beginResetModel()
+        self._rows = [self._format_row(*row) for row in rows]
+        self.endResetModel()
+
+
 class TradingPermissionsDialog(QDialog):
     """交易权限检测对话框"""
 
+    # 基本权限行：(显示名称, 权限字典键, 说明)
+    _PERMISSION_ROWS = (
+        ("A股交易", "A股交易", "主板、中小板股票交易"),
+        ("科创板交易", "科创板交易", "688开头股票交易"),
+        ("创业板交易", "创业板交易", "300开头股票交易"),
+    )
+    _PERM_CACHE_TTL = 60  # 单只股票权限测试结果缓存秒数
+
     def __init__(self, myquant_client, parent=None):
         super().__init__(parent)
         self.myquant_client = myquant_client
+        self._perm_cache = {}  # {code: (time.monotonic(), result)}
         self.setWindowTitle("交易权限检测")
         self.setModal(True)
         self.setFixedSize(600, 500)
@@ -4215,33 +5067,22 @@ class TradingPermissionsDialog(QDialog):
         # 标题
         title_label = QLabel("MyQuant交易权限检测")
         title_label.setAlignment(Qt.AlignCenter)
-        title_label.setStyleSheet(
-            """
-            QLabel {
-                font-size: 16pt;
-                font-weight: bold;
-                color: #333;
-                padding: 15px;
-                background-color: #f8f9fa;
-                border-radius: 8px;
-                margin-bottom: 10px;
-            }
-        """
-        )
+        title_label.setStyleSheet(_STYLE_PERM_TITLE)
         layout.addWidget(title_label)
 
         # 权限检测结果表格
-        self.permissions_table = QTableWidget(0, 3)
-        self.permissions_table.setHorizontalHeaderLabels(["权限类型", "状态", "说明"])
-        self.permissions_table.horizontalHeader().setSectionResizeMode(
-            0, QHeaderView.Fixed
-        )
-        self.permissions_table.horizontalHeader().setSectionResizeMode(
-            1, QHeaderView.Fixed
-        )
-        self.permissions_table.horizontalHeader().setSectionResizeMode(
-            2, QHeaderView.Stretch
-        )
+        self.permissions_model = PermissionsModel(self)
+        self.permissions_table = QTableView()
+        self.permissions_table.setModel(self.permissions_model)
+        # 列宽、行高固定，刷新时不按内容测量单元格尺寸
+        header = self.permissions_table.horizontalHeader()
+        header.setMinimumSectionSize(60)
+        header.setSectionResizeMode(0, QHeaderView.Fixed)
+        header.setSectionResizeMode(1, QHeaderView.Fixed)
+        header.setSectionResizeMode(2, QHeaderView.Stretch)
+        row_header = self.permissions_table.verticalHeader()
+        row_header.setSectionResizeMode(QHeaderView.Fixed)
+        row_header.setDefaultSectionSize(28)
         self.permissions_table.setColumnWidth(0, 120)
         self.permissions_table.setColumnWidth(1, 80)
         layout.addWidget(self.permissions_table)
@@ -4260,18 +5101,7 @@ class TradingPermissionsDialog(QDialog):
 • 实盘账户：需要实际开通相应权限
         """
         )
-        kcb_info.setStyleSheet(
-            """
-            QLabel {
-                background-color: #e8f4fd;
-                padding: 15px;
-                border-radius: 8px;
-                border-left: 4px solid #2196f3;
-                font-size: 9pt;
-                line-height: 1.4;
-            }
-        """
-        )
+        kcb_info.setStyleSheet(_STYLE_INFO_BANNER)
         layout.addWidget(kcb_info)
 
         # 股票权限测试区域
@@ -4280,7 +5110,8 @@ class TradingPermissionsDialog(QDialog):
 
         self.stock_code_edit = QLineEdit()
         self.stock_code_edit.setPlaceholderText("输入股票代码，如: 688001")
-        self.stock_code_edit.setMaxLength(6)
+        # 输入时即限制为6位数字（校验器负责长度，粘贴的 600000.SH 等先去掉前后缀）
+        self.stock_code_edit.setValidator(StockCodeValidator(self))
         test_layout.addWidget(QLabel("股票代码:"))
         test_layout.addWidget(self.stock_code_edit)
 
@@ -4292,16 +5123,7 @@ class TradingPermissionsDialog(QDialog):
 
         # 测试结果显示
         self.test_result_label = QLabel("请输入股票代码并点击测试")
-        self.test_result_label.setStyleSheet(
-            """
-            QLabel {
-                padding: 10px;
-                background-color: #f8f9fa;
-                border-radius: 5px;
-                border: 1px solid #dee2e6;
-            }
-        """
-        )
+        self.test_result_label.setStyleSheet(_STYLE_RESULT_BOX)
         layout.addWidget(self.test_result_label)
 
         # 按钮
@@ -4320,61 +5142,39 @@ class TradingPermissionsDialog(QDialog):
         self.setLayout(layout)
 
     def check_permissions(self):
-        """检测交易权限"""
-        # 清空表格
-        self.permissions_table.setRowCount(0)
+        """检测交易权限（先收集全部结果，再一次性刷新表格）"""
+        rows = []
 
         try:
             # 获取权限信息
             permissions = self.myquant_client.check_trading_permissions()
 
             # 显示基本权限
-            self.add_permission_row(
-                "A股交易", permissions.get("A股交易", False), "主板、中小板股票交易"
-            )
-            self.add_permission_row(
-                "科创板交易", permissions.get("科创板交易", False), "688开头股票交易"
-            )
-            self.add_permission_row(
-                "创业板交易", permissions.get("创业板交易", False), "300开头股票交易"
-            )
+            for label, key, description in self._PERMISSION_ROWS:
+                rows.append((label, permissions.get(key, False), description))
 
             # 显示账户信息
             account_type = permissions.get("账户类型", "未知")
             check_time = permissions.get("检测时间", "未知")
 
-            self.add_permission_row("账户类型", account_type, f"检测时间: {check_time}")
+            rows.append(("账户类型", account_type, f"检测时间: {check_time}"))
 
             # 显示错误信息（如果有）
             if "错误" in permissions:
-                self.add_permission_row("检测状态", False, permissions["错误"])
+                rows.append(("检测状态", False, permissions["错误"]))
 
         except Exception as e:
-            self.add_permission_row("检测异常", False, f"检测过程发生异常: {str(e)}")
-
-    def add_permission_row(self, permission_type, status, description):
-        """添加权限行到表格"""
-        row = self.permissions_table.rowCount()
-        self.permissions_table.insertRow(row)
-
-        # 权限类型
-        type_item = QTableWidgetItem(permission_type)
-        self.permissions_table.setItem(row, 0, type_item)
-
-        # 状态
-        if isinstance(status, bool):
-            status_text = "✅ 有权限" if status else "❌ 无权限"
-            status_item = QTableWidgetItem(status_text)
-            status_item.setForeground(QColor("green" if status else "red"))
-        else:
-            status_item = QTableWidgetItem(str(status))
-            status_item.setForeground(QColor("blue"))
+            rows.append(("检测异常", False, f"检测过程发生异常: {str(e)}"))
 
-        self.permissions_table.setItem(row, 1, status_item)
+        self._populate(rows)
 
-        # 说明
-        desc_item = QTableWidgetItem(description)
-        self.permissions_table.setItem(row, 2, desc_item)
+    def _populate(self, rows):
+        """批量写入权限行 [(权限类型, 状态, 说明)]，整个表格只刷新一次"""
+        self.permissions_table.setUpdatesEnabled(False)
+        try:
+            self.permissions_model.set_rows(rows)
+        finally:
+            self.permissions_table.setUpdatesEnabled(True)
 
     def test_stock_permission(self):
         """测试单只股票的交易权限"""
@@ -4389,8 +5189,14 @@ class TradingPermissionsDialog(QDialog):
             return
 
         try:
-            # 检测股票权限
-            result = self.myquant_client.check_stock_trading_permission(code)
+            # 检测股票权限（短时间内重复测试同一代码直接使用缓存结果）
+            now = time.monotonic()
+            cached = self._perm_cache.get(code)
+            if cached is not None and now - cached[0] < self._PERM_CACHE_TTL:
+                result = cached[1]
+            else:
+                result = self.myquant_client.check_stock_trading_permission(code)
+                self._perm_cache[code] = (now, result)
 
             # 格式化显示结果
             market = result.get("市场", "未知")
@@ -4428,7 +5234,7 @@ class SettingsDialog(QDialog):
 
         # 初始化加载遮罩
         self.loading_overlay = QLabel(self)
-        self.loading_overlay.setStyleSheet("background: rgba(255,255,255,0.8);")
+        self.loading_overlay.setStyleSheet(_STYLE_LOADING_OVERLAY)
         self.loading_overlay.setAlignment(Qt.AlignCenter)
         self.loading_overlay.setText("<b>配置加载中...</b>")
         self.loading_overlay.resize(self.size())
@@ -4455,27 +5261,77 @@ class SettingsDialog(QDialog):
             traceback.print_exc()
 
     def init_ui(self):
-        """初始化界面"""
+        """初始化界面：各设置分组放在选项卡中，首次切换到时才构建"""
         self.loading_overlay.hide()
         self.setWindowTitle("系统设置")
         self.setFixedSize(500, 600)  # 增加高度以容纳账户信息设置
 
         layout = QVBoxLayout(self)
 
-        # MyQuant设置
+        # 各分组控件在构建前为 None，保存时跳过未构建的分组
+        self.account_id_edit = None
+        self.token_edit = None
+        self.backup_source_combo = None
+        self.save_account_checkbox = None
+        self.data_path_edit = None
+        self.show_signals_checkbox = None
+
+        # 配置快照：一次读取各分组用到的配置项
+        self._cfg = {
+            "account_id": self.config.get("myquant.account_id", ""),
+            "token": self.config.get("myquant.token", ""),
+            "save_acc": self.config.get("account.save_account_info", True),
+            "path": self.config.get("data.storage_path", "gp_data"),
+            "show_signals": self.config.get("display.show_signals", False),
+        }
+
+        self._tab_builders = [
+            ("连接", self._build_myquant_group),
+            ("数据源", self._build_datasource_group),
+            ("账户缓存", self._build_account_group),
+            ("数据更新", self._build_data_group),
+            ("图表", self._build_chart_group),
+        ]
+        self._built = set()
+        self.tabs = QTabWidget()
+        for title, _builder in self._tab_builders:
+            page = QWidget()
+            QVBoxLayout(page)
+            self.tabs.addTab(page, title)
+        self.tabs.currentChanged.connect(self._ensure_tab_built)
+        self._ensure_tab_built(self.tabs.currentIndex())
+        layout.addWidget(self.tabs)
+
+        # 按钮
+        button_box = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel)
+        button_box.accepted.connect(self.accept)
+        button_box.rejected.connect(self.reject)
+        layout.addWidget(button_box)
+
+    def _ensure_tab_built(self, index):
+        """首次切换到选项卡时构建对应分组"""
+        if index < 0 or index in self._built:
+            return
+        self._built.add(index)
+        page_layout = self.tabs.widget(index).layout()
+        page_layout.addWidget(self._tab_builders[index][1]())
+        page_layout.addStretch()
+
+    def _build_myquant_group(self):
+        """MyQuant设置"""
         myquant_group = QGroupBox("掘金量化连接设置")
         myquant_layout = QFormLayout(myquant_group)
 
         # 只保留必要的连接配置
-        self.account_id_edit = QLineEdit(self.config.get("myquant.account_id", ""))
-        self.token_edit = QLineEdit(self.config.get("myquant.token", ""))
+        self.account_id_edit = QLineEdit(self._cfg["account_id"])
+        self.token_edit = QLineEdit(self._cfg["token"])
 
         myquant_layout.addRow("账户ID:", self.account_id_edit)
         myquant_layout.addRow("Token:", self.token_edit)
 
         # 添加说明文字
         info_label = QLabel("说明：账户余额、持仓等信息将从MyQuant客户端自动读取")
-        info_label.setStyleSheet("color: #666; font-size: 10px;")
+        info_label.setStyleSheet(_STYLE_HINT_SMALL)
         myquant_layout.addRow("", info_label)
 
         # 测试连接按钮
@@ -4483,9 +5339,10 @@ class SettingsDialog(QDialog):
         self.test_button.clicked.connect(self.test_connection)
         myquant_layout.addRow("", self.test_button)
 
-        layout.addWidget(myquant_group)
+        return myquant_group
 
-        # 数据源设置
+    def _build_datasource_group(self):
+        """数据源设置"""
         datasource_group = QGroupBox("数据源设置")
         datasource_layout = QFormLayout(datasource_group)
 
@@ -4498,18 +5355,16 @@ class SettingsDialog(QDialog):
         self.test_backup_button.clicked.connect(self.test_backup_source)
         datasource_layout.addRow("", self.test_backup_button)
 
-        layout.addWidget(datasource_group)
+        return datasource_group
 
-        # 账户信息设置
-        # 账户缓存设置
+    def _build_account_group(self):
+        """账户信息缓存设置"""
         account_group = QGroupBox("账户信息缓存设置")
         account_layout = QFormLayout(account_group)
 
         # 启用账户信息保存
         self.save_account_checkbox = QCheckBox("启用账户信息缓存")
-        self.save_account_checkbox.setChecked(
-            self.config.get("account.save_account_info", True)
-        )
+        self.save_account_checkbox.setChecked(self._cfg["save_acc"])
         account_layout.addRow("", self.save_account_checkbox)
 
         # 说明文字
@@ -4518,17 +5373,18 @@ class SettingsDialog(QDialog):
             "当API无法访问时，系统将使用缓存的账户信息。\n"
             "所有账户数据都从MyQuant客户端自动读取，无需手动设置。"
         )
-        account_info_label.setStyleSheet("color: #666; font-size: 10px;")
+        account_info_label.setStyleSheet(_STYLE_HINT_SMALL)
         account_layout.addRow("", account_info_label)
 
-        layout.addWidget(account_group)
+        return account_group
 
-        # 数据更新设置
+    def _build_data_group(self):
+        """数据更新设置"""
         data_group = QGroupBox("数据更新设置")
         data_layout = QFormLayout(data_group)
 
         # 历史数据存储路径
-        self.data_path_edit = QLineEdit(self.config.get("data.storage_path", "gp_data"))
+        self.data_path_edit = QLineEdit(self._cfg["path"])
         self.browse_path_button = QPushButton("浏览...")
         self.browse_path_button.clicked.connect(self.browse_data_path)
 
@@ -4544,13 +5400,26 @@ class SettingsDialog(QDialog):
         self.update_all_button.clicked.connect(self.update_all_historical_data)
         data_layout.addRow("", self.update_all_button)
 
-        layout.addWidget(data_group)
+        return data_group
 
-        # 按钮
-        button_box = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel)
-        button_box.accepted.connect(self.accept)
-        button_box.rejected.connect(self.reject)
-        layout.addWidget(button_box)
+    def _build_chart_group(self):
+        """图表显示设置"""
+        chart_group = QGroupBox("图表显示设置")
+        chart_layout = QFormLayout(chart_group)
+
+        # 交易信号标注
+        self.show_signals_checkbox = QCheckBox("在K线图上标注交易信号")
+        self.show_signals_checkbox.setChecked(self._cfg["show_signals"])
+        chart_layout.addRow("", self.show_signals_checkbox)
+
+        signals_info_label = QLabel(
+            "说明：启用后，每次载入K线时运行均线、MACD、RSI 信号检测，\n"
+            "并在最后一根K线处标注最新信号。"
+        )
+        signals_info_label.setStyleSheet(_STYLE_HINT_SMALL)
+        chart_layout.addRow("", signals_info_label)
+
+        return chart_group
 
     def browse_data_path(self):
         """浏览数据存储路径"""
@@ -4656,24 +5525,167 @@ class SettingsDialog(QDialog):
         super().closeEvent(event)
 
     def accept(self):
-        """保存设置"""
-        self.config.set("myquant.account_id", self.account_id_edit.text())
-        self.config.set("myquant.token", self.token_edit.text())
-        self.config.set("data.storage_path", self.data_path_edit.text())
+        """保存设置（只保存已构建的分组，未打开的分组保持原配置）"""
+        if self.account_id_edit is not None:
+            self.config.set("myquant.account_id", self.account_id_edit.text())
+            self.config.set("myquant.token", self.token_edit.text())
+        if self.data_path_edit is not None:
+            self.config.set("data.storage_path", self.data_path_edit.text())
 
         # 保存账户信息设置
-        self.config.set(
-            "account.save_account_info", self.save_account_checkbox.isChecked()
-        )
+        if self.save_account_checkbox is not None:
+            self.config.set(
+                "account.save_account_info", self.save_account_checkbox.isChecked()
+            )
+        if self.show_signals_checkbox is not None:
+            self.config.set(
+                "display.show_signals", self.show_signals_checkbox.isChecked()
+            )
 
         # 保存配置
         self.config.save_config()
         super().accept()
 
 
+class StockListModel(QAbstractListModel):
+    """股票候选列表模型：只保存 (代码, 名称)，显示文本在绘制时生成"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._items = []  # [(code, name)]
+        self._messages = []  # 无结果时的提示行 [(文本, 选中数据或None)]
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self._items) or len(self._messages)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        if self._items:
+            code, name = self._items[index.row()]
+            if role == Qt.DisplayRole:
+                return f"{code} - {name}"
+            if role == Qt.UserRole:
+                return (code, name)
+            return None
+        text, payload = self._messages[index.row()]
+        if role == Qt.DisplayRole:
+            return text
+        if role == Qt.UserRole:
+            return payload
+        return None
+
+    def flags(self, index):
+        if index.isValid() and not self._items:
+            if self._messages[index.row()][1] is None:
+                return Qt.ItemIsEnabled
+        return super().flags(index)
+
+    def set_items(self, items):
+        """替换股票列表"""
+        self.beginResetModel()
+        self._items = list(items)
+        self._messages = []
+        self.endResetModel()
+
+    def set_messages(self, messages):
+        """显示提示行（清空股票列表）"""
+        self.beginResetModel()
+        self._items = []
+        self._messages = list(messages)
+        self.endResetModel()
+
+
+_AK_CACHE_TTL = 300  # AkShare 查询结果缓存时间片（秒）
+
+
+def _ak_bucket():
+    """当前缓存时间片编号，作为缓存键的一部分使过期结果自然失效"""
+    return int(time.time() // _AK_CACHE_TTL)
+
+
+@lru_cache(maxsize=1)
+def _load_a_code_name(bucket):
+    """AkShare A股代码名称表（按时间片缓存，避免每次搜索重新下载全表）"""
+    import akshare as ak
+
+    return ak.stock_info_a_code_name()
+
+
+@lru_cache(maxsize=1)
+def _a_code_name_index(bucket):
+    """A股检索索引：(代码, 名称, 小写名称, {二元组: 行号集合}, 代码数组)
+
+    名称多为2~4个汉字、查询最短2个字符，因此按二元组（而非三元组）建立倒排表。
+    """
+    table = _load_a_code_name(bucket)
+    codes = table["code"].astype(str).str.zfill(6).tolist()
+    names = table["name"].astype(str).str.strip().tolist()
+    lowered = [name.lower() for name in names]
+    grams = {}
+    for row, name in enumerate(lowered):
+        for i in range(len(name) - 1):
+            grams.setdefault(name[i : i + 2], set()).add(row)
+    return codes, names, lowered, grams, np.array(codes)
+
+
+def _search_a_code_name(query, limit=10):
+    """按名称检索A股（query 已转小写）
+
+    先用倒排表求交集得到候选行并确认子串包含关系；安装了 rapidfuzz 时按相似度
+    排序，不足 limit 个再用模糊匹配补充（容错输入错字）。
+    """
+    codes, names, lowered, grams, codes_array = _a_code_name_index(_ak_bucket())
+    if query.isdigit():
+        # 纯数字按代码前缀向量化匹配（与本地搜索一致）
+        rows = np.flatnonzero(np.char.startswith(codes_array, query))[:limit]
+        return [(codes[row], names[row]) for row in rows.tolist()]
+
+    postings = [grams.get(query[i : i + 2]) for i in range(len(query) - 1)]
+    if postings and None not in postings:
+        postings.sort(key=len)
+        candidates = postings[0].intersection(*postings[1:])
+        rows = sorted(row for row in candidates if query in lowered[row])
+    else:
+        rows = []
+
+    if RAPIDFUZZ_AVAILABLE:
+        rows.sort(key=lambda row: -fuzz.WRatio(query, lowered[row]))
+        rows = rows[:limit]
+        if len(rows) < limit:
+            matched = set(rows)
+            for _choice, _score, row in process.extract(
+                query, lowered, scorer=fuzz.WRatio, limit=limit, score_cutoff=60
+            ):
+                if row not in matched:
+                    rows.append(row)
+                    if len(rows) >= limit:
+                        break
+    else:
+        rows = rows[:limit]
+    return [(codes[row], names[row]) for row in rows]
+
+
+@lru_cache(maxsize=256)
+def _load_individual_info(symbol, bucket):
+    """AkShare 个股信息（按代码和时间片缓存）"""
+    import akshare as ak
+
+    return ak.stock_individual_info_em(symbol=symbol)
+
+
 class AddStockDialog(QDialog):
     """添加股票对话框"""
 
+    online_search_done = pyqtSignal(str, list)  # query, [(code, name)]
+
+    # 股票列表在会话内基本不变，所有对话框实例共享，一天内再次打开无需重新加载
+    _stock_universe = {}  # {code: name}
+    _universe_loaded_at = None  # time.monotonic() 时间戳
+    _UNIVERSE_MAX_AGE = 86400
+
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setWindowTitle("添加股票到交易池")
@@ -4684,29 +5696,197 @@ class AddStockDialog(QDialog):
         self.name_edit = None
         self.search_edit = None
         self.stock_list = None
-        self.all_stocks = {}  # {code: name}
+        self.stock_model = None
+        self.all_stocks = AddStockDialog._stock_universe  # {code: name}，类级共享
+        # 本地搜索索引：(代码, 名称) 行、供正则检索的整段文本及各行偏移、排序后的代码数组
+        self._search_rows = []  # [(code, name)]，与检索文本的行一一对应
+        self._search_text = ""  # 每行 "代码\t小写名称"，整体交给正则检索
+        self._line_starts = []  # 各行在检索文本中的起始偏移
+        self._sorted_codes = []  # 排序后的代码，用于数字前缀二分查找
+        # 在线搜索结果缓存（LRU）：{query: (monotonic 时刻, ((code, name), ...))}，
+        # 只在主线程读写
+        self._online_cache = OrderedDict()
+        self._online_pending = set()  # 正在后台查询的关键字
+        self.online_search_done.connect(self._on_online_search_done)
 
-        self.load_stock_data()
         self.init_ui()
+        self._start_stock_loading()
 
-    def load_stock_data(self):
-        """加载股票数据 - 优先实时查询"""
-        # 优先级1: MyQuant实时查询
-        if self.load_from_myquant():
+    def _start_stock_loading(self):
+        """后台加载股票列表，加载期间对话框可直接使用（手动输入不受影响）"""
+        loaded_at = AddStockDialog._universe_loaded_at
+        if (
+            self.all_stocks
+            and loaded_at is not None
+            and time.monotonic() - loaded_at < self._UNIVERSE_MAX_AGE
+        ):
+            self._on_stocks_loaded({})
             return
 
-        # 优先级2: AkShare实时查询
-        if self.load_from_akshare():
-            return
+        self.data_source_label.setText("📊 股票数据: 加载中...")
+        self.stock_model.set_messages([("⏳ 正在加载股票列表...", None)])
+        self.loader_thread = StockUniverseThread(self.collect_stock_data)
+        self.loader_thread.loaded.connect(self._on_stocks_loaded)
+        self.loader_thread.start()
+
+    def _on_stocks_loaded(self, stocks):
+        """股票列表加载完成（主线程）"""
+        if stocks:
+            self.all_stocks.update(stocks)
+            AddStockDialog._universe_loaded_at = time.monotonic()
+        self._rebuild_search_index()
+        self.data_source_label.setText(f"📊 股票数据: {len(self.all_stocks)}只")
+        # 按当前搜索内容刷新列表（为空时显示前50只）
+        self.filter_stocks(self.search_edit.text())
+
+    def done(self, result):
+        """关闭对话框：仍在运行的加载线程不再回调界面，放其自行结束"""
+        thread = getattr(self, "loader_thread", None)
+        if thread is not None and thread.isRunning():
+            # 不强制终止：线程在执行网络请求和写缓存，terminate 可能留下半截文件或锁
+            thread.loaded.disconnect(self._on_stocks_loaded)
+            # 结束前保留引用，结束后由事件循环释放
+            AddStockDialog._detached_loaders.add(thread)
+            thread.finished.connect(thread.deleteLater)
+            thread.destroyed.connect(
+                lambda: AddStockDialog._detached_loaders.discard(thread)
+            )
+            if thread.isFinished():
+                thread.deleteLater()  # 连接前刚好结束，finished 已错过
+        super().done(result)
+
+    # 股票列表日缓存目录（按数据源和日期保存，当天重复打开对话框无需联网）
+    _UNIVERSE_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".sharecode_cache")
+    _UNIVERSE_CACHE_DAYS = 7
+    # 对话框关闭时仍在运行的加载线程（结束前需保留引用）
+    _detached_loaders = set()
+
+    def load_stock_data(self, use_cache=True):
+        """同步加载股票数据并重建搜索索引"""
+        self.all_stocks.update(self.collect_stock_data(use_cache))
+        AddStockDialog._universe_loaded_at = time.monotonic()
+        self._rebuild_search_index()
+
+    def collect_stock_data(self, use_cache=True):
+        """获取股票数据 - 优先当日缓存，其次实时查询
+
+        不访问界面控件和 all_stocks，可在 StockUniverseThread 中执行。
+        """
+        stocks = {}
+        # 优先级0: 当日缓存
+        if use_cache and any(
+            self._load_cached_universe(source, stocks)
+            for source in ("myquant", "akshare")
+        ):
+            return stocks
 
+        # 优先级1: MyQuant实时查询
+        # 优先级2: AkShare实时查询
+        if self.load_from_myquant(stocks):
+            self._save_cached_universe("myquant", stocks)
+            self._save_local_file(stocks)
+        elif self.load_from_akshare(stocks):
+            self._save_cached_universe("akshare", stocks)
+            self._save_local_file(stocks)
         # 优先级3: 本地文件（带时效检查）
-        if self.load_from_local_file():
-            return
+        elif not self.load_from_local_file(stocks):
+            # 优先级4: 默认股票列表
+            self.load_default_stocks(stocks)
+        return stocks
+
+    def _universe_cache_path(self, source):
+        """当日股票列表缓存文件路径"""
+        filename = f"stocks_{source}_{datetime.now():%Y%m%d}.pkl"
+        return os.path.join(self._UNIVERSE_CACHE_DIR, filename)
+
+    def _load_cached_universe(self, source, stocks):
+        """读取当日缓存的股票列表，成功返回 True"""
+        path = self._universe_cache_path(source)
+        if not os.path.exists(path):
+            return False
+        try:
+            with open(path, "rb") as f:
+                cached = pickle.load(f)
+        except Exception as e:
+            logging.warning(f"⚠️ 股票列表缓存读取失败({source}): {e}")
+            return False
+        if not isinstance(cached, dict) or not cached:
+            return False
+        stocks.update(cached)
+        logging.info(f"📦 从当日缓存加载{len(cached)}只股票数据({source})")
+        return True
 
-        # 优先级4: 默认股票列表
-        self.load_default_stocks()
+    def _save_cached_universe(self, source, stocks):
+        """保存股票列表到当日缓存，并清理过期缓存文件"""
+        try:
+            os.makedirs(self._UNIVERSE_CACHE_DIR, exist_ok=True)
+            # 先写临时文件再原子替换，中途失败不会留下半截缓存
+            path = self._universe_cache_path(source)
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "wb") as f:
+                pickle.dump(stocks, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+            self._sweep_universe_cache()
+        except Exception as e:
+            logging.warning(f"⚠️ 股票列表缓存保存失败({source}): {e}")
+
+    def _sweep_universe_cache(self):
+        """删除超过保留天数的缓存文件"""
+        expire = time.time() - self._UNIVERSE_CACHE_DAYS * 86400
+        with os.scandir(self._UNIVERSE_CACHE_DIR) as entries:
+            for entry in entries:
+                if (
+                    entry.name.startswith("stocks_")
+                    and entry.name.endswith(".pkl")
+                    and entry.stat().st_mtime < expire
+                ):
+                    os.remove(entry.path)
+
+    def _rebuild_search_index(self):
+        """按 all_stocks 重建搜索索引（名称预先转小写）"""
+        self._sorted_codes = sorted(self.all_stocks)
+        self._search_rows = list(self.all_stocks.items())
+        lines = [f"{code}\t{name.lower()}" for code, name in self._search_rows]
+        self._line_starts = []
+        offset = 0
+        for line in lines:
+            self._line_starts.append(offset)
+            offset += len(line) + 1
+        self._search_text = "\n".join(lines)
+
+    def _search_local(self, text, limit=100):
+        """本地搜索：纯数字按代码前缀匹配，其余按代码或名称包含（text 已转小写）"""
+        if len(self._sorted_codes) != len(self.all_stocks):
+            self._rebuild_search_index()
+        if not self._search_rows:
+            return []
+        if text.isdigit():
+            # 数字输入按代码前缀二分查找
+            codes = self._sorted_codes
+            results = []
+            i = bisect.bisect_left(codes, text)
+            while i < len(codes) and len(results) < limit:
+                code = codes[i]
+                if not code.startswith(text):
+                    break
+                results.append((code, self.all_stocks[code]))
+                i += 1
+            return results
+
+        # 其余输入编译为正则，在整段检索文本上匹配，命中位置二分映射回行号
+        pattern = re.compile(re.escape(text))
+        results = []
+        last_row = -1
+        for match in pattern.finditer(self._search_text):
+            row = bisect.bisect_right(self._line_starts, match.start()) - 1
+            if row != last_row:
+                results.append(self._search_rows[row])
+                last_row = row
+                if len(results) >= limit:
+                    break
+        return results
 
-    def load_from_myquant(self):
+    def load_from_myquant(self, stocks):
         """从MyQuant实时获取A股股票列表（使用get_symbols）"""
         try:
             logging.info("🔍 正在从MyQuant实时获取A股股票数据(get_symbols)...")
@@ -4742,7 +5922,7 @@ class AddStockDialog(QDialog):
                 return False
 
             # 获取所有A股股票，包含停牌和ST
-            stocks = gm.get_symbols(
+            symbols_df = gm.get_symbols(
                 sec_type1=1010,  # 股票
                 sec_type2=101001,  # A股
                 skip_suspended=False,
@@ -4750,16 +5930,18 @@ class AddStockDialog(QDialog):
                 trade_date=None,
                 df=True,
             )
-            if stocks is not None and not stocks.empty:
-                for _, row in stocks.iterrows():
-                    symbol = str(row.get("symbol", ""))
-                    name = str(row.get("sec_name", row.get("name", ""))).strip()
+            if symbols_df is not None and not symbols_df.empty:
+                name_column = "sec_name" if "sec_name" in symbols_df else "name"
+                if "symbol" in symbols_df and name_column in symbols_df:
                     # symbol格式如 SHSE.600000
-                    if "." in symbol:
-                        code = symbol.split(".")[1]
-                        self.all_stocks[code] = name
+                    symbols = symbols_df["symbol"].astype(str)
+                    valid = symbols.str.contains(".", regex=False)
+                    codes = symbols[valid].str.split(".").str[1]
+                    names = symbols_df.loc[valid, name_column]
+                    names = names.astype(str).str.strip()
+                    stocks.update(zip(codes.to_numpy(), names.to_numpy()))
                 logging.info(
-                    f"✅ MyQuant(get_symbols)获取{len(self.all_stocks)}只A股股票数据"
+                    f"✅ MyQuant(get_symbols)获取{len(stocks)}只A股股票数据"
                 )
                 return True
             else:
@@ -4768,7 +5950,14 @@ class AddStockDialog(QDialog):
             logging.warning(f"⚠️ MyQuant(get_symbols)股票数据获取失败: {e}")
         return False
 
-    def load_from_akshare(self):
+    @staticmethod
+    def _code_name_pairs(df):
+        """将含 code/name 列的 DataFrame 按列整体转换为 (6位代码, 名称) 序列"""
+        codes = df["code"].astype(str).str.zfill(6).to_numpy()
+        names = df["name"].astype(str).str.strip().to_numpy()
+        return zip(codes.tolist(), names.tolist())
+
+    def load_from_akshare(self, stocks):
         """从AkShare实时获取股票列表"""
         try:
             logging.info("🔍 正在从AkShare实时获取股票数据...")
@@ -4778,12 +5967,9 @@ class AddStockDialog(QDialog):
             stock_info = ak.stock_info_a_code_name()
 
             if stock_info is not None and len(stock_info) > 0:
-                for _, row in stock_info.iterrows():
-                    code = str(row["code"]).zfill(6)
-                    name = str(row["name"]).strip()
-                    self.all_stocks[code] = name
+                stocks.update(self._code_name_pairs(stock_info))
 
-                logging.info(f"✅ AkShare实时获取{len(self.all_stocks)}只股票数据")
+                logging.info(f"✅ AkShare实时获取{len(stocks)}只股票数据")
                 return True
 
         except Exception as e:
@@ -4791,20 +5977,47 @@ class AddStockDialog(QDialog):
 
         return False
 
-    def load_from_local_file(self):
-        """从本地文件加载股票数据（带时效检查）"""
+    _LOCAL_CSV = "A股列表.csv"
+    # Feather 副本与其他缓存放在同一目录，不写入当前工作目录
+    _LOCAL_FEATHER = os.path.join(_UNIVERSE_CACHE_DIR, "A股列表.feather")
+
+    def _save_local_file(self, stocks):
+        """联网获取成功后另存 Feather 列式文件，供离线时快速加载（需要 pyarrow）"""
         try:
-            import os
-            from datetime import datetime, timedelta
+            os.makedirs(self._UNIVERSE_CACHE_DIR, exist_ok=True)
+            path = self._LOCAL_FEATHER
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            pd.DataFrame(
+                {"code": list(stocks), "name": list(stocks.values())}
+            ).to_feather(tmp_path)
+            os.replace(tmp_path, path)
+        except ImportError:
+            pass  # 未安装 pyarrow 时仅使用 CSV
+        except Exception as e:
+            logging.warning(f"⚠️ 本地股票数据文件保存失败: {e}")
 
-            import pandas as pd
+    def load_from_local_file(self, stocks):
+        """从本地文件加载股票数据（带时效检查），Feather 不旧于 CSV 时优先 Feather"""
+        try:
+            df = None
+            file_path = self._LOCAL_FEATHER
+            # 用户更新过 CSV（比 Feather 新）时以 CSV 为准
+            if os.path.exists(file_path) and (
+                not os.path.exists(self._LOCAL_CSV)
+                or os.path.getmtime(file_path) >= os.path.getmtime(self._LOCAL_CSV)
+            ):
+                try:
+                    df = pd.read_feather(file_path)
+                except Exception as e:
+                    logging.warning(f"⚠️ Feather股票数据读取失败，改用CSV: {e}")
 
-            file_path = "A股列表.csv"
+            if df is None:
+                file_path = self._LOCAL_CSV
 
-            # 检查文件是否存在
-            if not os.path.exists(file_path):
-                logging.warning("⚠️ 本地股票数据文件不存在")
-                return False
+                # 检查文件是否存在
+                if not os.path.exists(file_path):
+                    logging.warning("⚠️ 本地股票数据文件不存在")
+                    return False
 
             # 检查文件时效（超过7天提示更新）
             file_time = datetime.fromtimestamp(os.path.getmtime(file_path))
@@ -4814,14 +6027,12 @@ class AddStockDialog(QDialog):
                 )
 
             # 加载本地文件
-            df = pd.read_csv(file_path, encoding="utf-8")
-            for _, row in df.iterrows():
-                code = str(row["code"]).zfill(6)
-                name = str(row["name"]).strip()
-                self.all_stocks[code] = name
+            if df is None:
+                df = pd.read_csv(file_path, encoding="utf-8")
+            stocks.update(self._code_name_pairs(df))
 
             logging.info(
-                f"📁 从本地文件加载{len(self.all_stocks)}只股票数据 (文件日期: {file_time.strftime('%Y-%m-%d')})"
+                f"📁 从本地文件加载{len(stocks)}只股票数据 (文件日期: {file_time.strftime('%Y-%m-%d')})"
             )
             return True
 
@@ -4830,7 +6041,7 @@ class AddStockDialog(QDialog):
 
         return False
 
-    def load_default_stocks(self):
+    def load_default_stocks(self, stocks):
         """加载默认股票列表（备用方案）"""
 
     def init_ui(self):
@@ -4840,53 +6051,21 @@ class AddStockDialog(QDialog):
         # 标题
         title_label = QLabel("添加股票到交易池")
         title_label.setAlignment(Qt.AlignCenter)
-        title_label.setStyleSheet(
-            """
-            QLabel {
-                font-size: 14pt;
-                font-weight: bold;
-                color: #333;
-                padding: 10px;
-            }
-        """
-        )
+        title_label.setStyleSheet(_STYLE_DIALOG_TITLE)
         layout.addWidget(title_label)
 
         # 数据源状态显示
         data_source_layout = QHBoxLayout()
 
         self.data_source_label = QLabel(f"📊 股票数据: {len(self.all_stocks)}只")
-        self.data_source_label.setStyleSheet(
-            """
-            QLabel {
-                background-color: #e8f5e8;
-                padding: 5px 10px;
-                border-radius: 4px;
-                border-left: 3px solid #4caf50;
-                font-size: 9pt;
-            }
-        """
-        )
+        self._source_style = None
+        self._set_source_style(_STYLE_SOURCE_OK)
         data_source_layout.addWidget(self.data_source_label)
 
         refresh_button = QPushButton("🔄 刷新数据")
         refresh_button.setToolTip("重新从MyQuant/AkShare获取最新股票数据")
         refresh_button.clicked.connect(self.refresh_stock_data)
-        refresh_button.setStyleSheet(
-            """
-            QPushButton {
-                background-color: #2196f3;
-                color: white;
-                border: none;
-                padding: 5px 10px;
-                border-radius: 4px;
-                font-size: 9pt;
-            }
-            QPushButton:hover {
-                background-color: #1976d2;
-            }
-        """
-        )
+        refresh_button.setStyleSheet(_STYLE_BLUE_BTN)
         data_source_layout.addWidget(refresh_button)
 
         data_source_layout.addStretch()
@@ -4905,7 +6084,9 @@ class AddStockDialog(QDialog):
         # 股票代码输入
         self.code_edit = QLineEdit()
         self.code_edit.setPlaceholderText("请输入6位股票代码，如: 000001")
-        self.code_edit.setMaxLength(6)
+        # 输入时即限制为6位数字，无需在 textChanged 中过滤后回写；
+        # 不设 maxLength，以免粘贴 SHSE.600000 等带前后缀的代码时先被截断
+        self.code_edit.setValidator(StockCodeValidator(self))
         self.code_edit.textChanged.connect(self.on_code_changed)
         form_layout.addRow("股票代码:", self.code_edit)
 
@@ -4919,7 +6100,7 @@ class AddStockDialog(QDialog):
 
         # 提示信息
         tip_label = QLabel("💡 提示: 代码必须是6位数字，名称可以自定义")
-        tip_label.setStyleSheet("color: #666; font-size: 9pt; padding: 5px;")
+        tip_label.setStyleSheet(_STYLE_TIP)
         manual_layout.addWidget(tip_label)
 
         tab_widget.addTab(manual_tab, "手动输入")
@@ -4930,15 +6111,13 @@ class AddStockDialog(QDialog):
 
         # 搜索说明
         search_info = QLabel("🔍 智能股票搜索")
-        search_info.setStyleSheet("font-weight: bold; color: #333; padding: 5px;")
+        search_info.setStyleSheet(_STYLE_SECTION_TITLE)
         search_layout.addWidget(search_info)
 
         search_desc = QLabel(
             "• 本地优先：快速搜索已缓存的股票数据\n• 在线补充：本地无结果时自动联网查询\n• 实时更新：支持MyQuant/AkShare数据源"
         )
-        search_desc.setStyleSheet(
-            "color: #666; font-size: 9pt; padding: 5px; background-color: #f8f9fa; border-radius: 4px;"
-        )
+        search_desc.setStyleSheet(_STYLE_SEARCH_DESC)
         search_layout.addWidget(search_desc)
 
         # 搜索框
@@ -4949,17 +6128,25 @@ class AddStockDialog(QDialog):
         self.search_edit.setPlaceholderText(
             "输入股票代码或名称进行搜索... (支持在线查询)"
         )
-        self.search_edit.textChanged.connect(self.filter_stocks)
+        # 搜索防抖：连续输入只在停顿后检索一次（避免逐字触发在线查询）
+        self._search_timer = QTimer(self)
+        self._search_timer.setSingleShot(True)
+        self._search_timer.setInterval(250)
+        self._search_timer.timeout.connect(
+            lambda: self.filter_stocks(self.search_edit.text())
+        )
+        self.search_edit.textChanged.connect(lambda _text: self._search_timer.start())
         search_layout.addWidget(self.search_edit)
 
         # 股票列表
-        self.stock_list = QListWidget()
-        self.stock_list.itemDoubleClicked.connect(self.on_stock_selected)
+        self.stock_model = StockListModel(self)
+        self.stock_list = QListView()
+        self.stock_list.setModel(self.stock_model)
+        # 所有行等高：只测量一次行高，不逐行计算尺寸
+        self.stock_list.setUniformItemSizes(True)
+        self.stock_list.doubleClicked.connect(self.on_stock_selected)
         search_layout.addWidget(self.stock_list)
 
-        # 初始显示所有股票（限制数量）
-        self.show_stocks(list(self.all_stocks.items())[:50])  # 只显示前50只
-
         tab_widget.addTab(search_tab, "搜索选择")
 
         layout.addWidget(tab_widget)
@@ -4974,25 +6161,7 @@ class AddStockDialog(QDialog):
         self.ok_button = QPushButton("添加")
         self.ok_button.clicked.connect(self.accept)
         self.ok_button.setEnabled(False)  # 初始禁用
-        self.ok_button.setStyleSheet(
-            """
-            QPushButton {
-                background-color: #4CAF50;
-                color: white;
-                border: none;
-                padding: 8px 16px;
-                border-radius: 4px;
-                font-weight: bold;
-            }
-            QPushButton:hover {
-                background-color: #45a049;
-            }
-            QPushButton:disabled {
-                background-color: #cccccc;
-                color: #666666;
-            }
-        """
-        )
+        self.ok_button.setStyleSheet(_STYLE_GREEN_BTN)
         button_layout.addWidget(self.ok_button)
 
         layout.addLayout(button_layout)
@@ -5001,75 +6170,98 @@ class AddStockDialog(QDialog):
 
     def show_stocks(self, stock_items):
         """显示股票列表"""
-        self.stock_list.clear()
-        for code, name in stock_items:
-            item_text = f"{code} - {name}"
-            item = QListWidgetItem(item_text)
-            item.setData(Qt.UserRole, (code, name))  # 存储股票信息
-            self.stock_list.addItem(item)
+        self.stock_model.set_items(stock_items)
 
     def filter_stocks(self, text):
         """过滤股票列表（增强版：支持在线搜索）"""
+        text = text.strip().lower()
         if not text:
             # 如果搜索框为空，显示前50只股票
             self.show_stocks(list(self.all_stocks.items())[:50])
             return
 
-        text = text.lower()
-        filtered_stocks = []
-
-        # 本地搜索
-        for code, name in self.all_stocks.items():
-            if (
-                text in code.lower() or text in name.lower() or text in name
-            ):  # 支持中文搜索
-                filtered_stocks.append((code, name))
-                if len(filtered_stocks) >= 100:  # 限制显示数量
-                    break
-
-        # 如果本地搜索结果少于5个，尝试在线搜索
-        if len(filtered_stocks) < 5 and len(text) >= 2:
-            try:
-                online_results = self.search_stock_online(text)
-                for code, name in online_results:
-                    # 避免重复添加
-                    if not any(
-                        existing_code == code for existing_code, _ in filtered_stocks
-                    ):
-                        filtered_stocks.append((code, name))
-                        # 同时添加到本地缓存中
-                        self.all_stocks[code] = name
-            except Exception as e:
-                logging.warning(f"⚠️ 在线搜索失败: {e}")
+        # 本地搜索（限制显示数量）
+        filtered_stocks = self._search_local(text, 100)
+
+        # 如果本地搜索结果少于5个，尝试在线搜索（有缓存直接合并，否则后台查询）
+        # 完整6位代码已在本地列表中时无需联网
+        searching = False
+        exact_code = len(text) == 6 and text in self.all_stocks
+        if len(filtered_stocks) < 5 and len(text) >= 2 and not exact_code:
+            cached = self._online_cache.get(text)
+            if cached is not None and self._online_cache_fresh(cached):
+                self._online_cache.move_to_end(text)
+                self._merge_online_results(filtered_stocks, cached[1])
+            else:
+                self._request_online_search(text)
+                searching = True
 
         self.show_stocks(filtered_stocks)
 
         # 如果没有找到任何结果，显示提示
         if not filtered_stocks:
-            self.stock_list.clear()
-            no_result_item = QListWidgetItem("🔍 未找到匹配的股票")
-            no_result_item.setFlags(no_result_item.flags() & ~Qt.ItemIsSelectable)
-            self.stock_list.addItem(no_result_item)
-
+            if searching:
+                messages = [(f"🌐 正在在线搜索: {text}", None)]
+            else:
+                messages = [("🔍 未找到匹配的股票", None)]
             if len(text) >= 6 and text.isdigit():
-                search_item = QListWidgetItem(f"💡 尝试在线搜索: {text}")
-                search_item.setData(Qt.UserRole, (text, f"搜索股票{text}"))
-                self.stock_list.addItem(search_item)
+                messages.append((f"💡 尝试在线搜索: {text}", (text, f"搜索股票{text}")))
+            self.stock_model.set_messages(messages)
+
+    def _merge_online_results(self, filtered_stocks, online_results):
+        """将在线结果去重追加到过滤结果，并同时加入本地股票列表"""
+        known = {code for code, _ in filtered_stocks}
+        for code, name in online_results:
+            if code not in known:
+                known.add(code)
+                filtered_stocks.append((code, name))
+                self.all_stocks[code] = name
 
-    def on_stock_selected(self, item):
+    def _request_online_search(self, query):
+        """提交后台在线查询，结果经 online_search_done 信号回到主线程"""
+        if query not in self._online_pending:
+            self._online_pending.add(query)
+            # 守护线程：网络查询卡住时不阻塞程序退出
+            thread = threading.Thread(
+                target=self._online_search_task, args=(query,)
+            )
+            thread.daemon = True
+            thread.start()
+
+    def _online_search_task(self, query):
+        """后台线程中执行：网络查询后发出信号（不访问界面和缓存）"""
+        try:
+            results = self.search_stock_online(query)
+        except Exception as e:
+            logging.warning(f"⚠️ 在线搜索失败: {e}")
+            results = []
+        try:
+            self.online_search_done.emit(query, results)
+        except RuntimeError:
+            pass  # 对话框已关闭
+
+    def _on_online_search_done(self, query, results):
+        """在线查询完成（主线程）：写入缓存，若仍是当前搜索内容则刷新列表"""
+        self._online_pending.discard(query)
+        self._online_cache[query] = (time.monotonic(), tuple(results))
+        self._online_cache.move_to_end(query)
+        while len(self._online_cache) > self._ONLINE_CACHE_SIZE:
+            self._online_cache.popitem(last=False)
+        if self.search_edit.text().strip().lower() == query:
+            self.filter_stocks(query)
+
+    def on_stock_selected(self, index):
         """股票被选中时"""
-        code, name = item.data(Qt.UserRole)
+        stock = index.data(Qt.UserRole)
+        if not stock:
+            return
+        code, name = stock
         self.code_edit.setText(code)
         self.name_edit.setText(name)
         self.update_ok_button()
 
     def on_code_changed(self, text):
-        """股票代码输入变化时的处理"""
-        # 只允许数字输入
-        if text and not text.isdigit():
-            self.code_edit.setText("".join(filter(str.isdigit, text)))
-            return
-
+        """股票代码输入变化时的处理（数字限制由输入校验器完成）"""
         # 如果代码在股票列表中，自动填充名称
         if len(text) == 6 and text in self.all_stocks:
             self.name_edit.setText(self.all_stocks[text])
@@ -5105,10 +6297,12 @@ class AddStockDialog(QDialog):
 
             # 清空当前数据
             old_count = len(self.all_stocks)
-            self.all_stocks.clear()
+            self.all_stocks.clear()  # 同时清空类级共享列表
+            AddStockDialog._universe_loaded_at = None
+            self._online_cache.clear()
 
-            # 重新加载数据
-            self.load_stock_data()
+            # 重新加载数据（跳过当日缓存，强制联网）
+            self.load_stock_data(use_cache=False)
 
             # 更新界面
             new_count = len(self.all_stocks)
@@ -5122,54 +6316,51 @@ class AddStockDialog(QDialog):
 
             # 显示刷新结果
             if new_count > old_count:
-                self.data_source_label.setStyleSheet(
-                    """
-                    QLabel {
-                        background-color: #e8f5e8;
-                        padding: 5px 10px;
-                        border-radius: 4px;
-                        border-left: 3px solid #4caf50;
-                        font-size: 9pt;
-                    }
-                """
-                )
+                self._set_source_style(_STYLE_SOURCE_OK)
                 logging.info(f"✅ 股票数据已刷新: {old_count} → {new_count}")
             else:
-                self.data_source_label.setStyleSheet(
-                    """
-                    QLabel {
-                        background-color: #fff3e0;
-                        padding: 5px 10px;
-                        border-radius: 4px;
-                        border-left: 3px solid #ff9800;
-                        font-size: 9pt;
-                    }
-                """
-                )
+                self._set_source_style(_STYLE_SOURCE_STALE)
                 logging.warning(f"⚠️ 股票数据未更新: {new_count}只")
 
         except Exception as e:
             logging.error(f"❌ 刷新股票数据失败: {e}")
 
+    _ONLINE_CACHE_SIZE = 256
+    # 空结果可能来自网络/AkShare 故障，只短时缓存，过期后重新查询
+    _ONLINE_EMPTY_TTL = 30.0
+
+    def _online_cache_fresh(self, entry):
+        """在线缓存条目是否仍有效：空结果 _ONLINE_EMPTY_TTL 秒，其余 _AK_CACHE_TTL 秒"""
+        cached_at, results = entry
+        ttl = _AK_CACHE_TTL if results else self._ONLINE_EMPTY_TTL
+        return time.monotonic() - cached_at < ttl
+
+    def _set_source_style(self, style):
+        """设置数据源标签样式（样式未变化时跳过，避免控件重新应用样式）"""
+        if style is not self._source_style:
+            self.data_source_label.setStyleSheet(style)
+            self._source_style = style
+
     def search_stock_online(self, query):
-        """在线搜索股票（当本地搜索无结果时）"""
+        """在线搜索股票（当本地搜索无结果时，在后台线程中执行）"""
         try:
+            # 关键字只规范化一次
+            query = query.strip().lower()
             if len(query) < 2:
                 return []
+            is_code = query.isdigit() and len(query) == 6
 
-            logging.info(f"🔍 在线搜索股票: {query}")
+            logging.info("🔍 在线搜索股票: %s", query)
             results = []
 
             # 尝试使用AkShare搜索
             try:
-                import akshare as ak
-
                 # 如果是6位数字，可能是股票代码
-                if query.isdigit() and len(query) == 6:
+                if is_code:
                     # 尝试获取股票信息
                     try:
-                        stock_individual_info = ak.stock_individual_info_em(
-                            symbol=query
+                        stock_individual_info = _load_individual_info(
+                            query, _ak_bucket()
                         )
                         if (
                             stock_individual_info is not None
@@ -5181,36 +6372,25 @@ class AddStockDialog(QDialog):
                             if len(name_row) > 0:
                                 name = name_row["value"].iloc[0]
                                 results.append((query, name))
-                                logging.info(f"✅ 在线找到股票: {query} - {name}")
                     except Exception:
                         pass
 
                 # 尝试模糊搜索股票名称
                 else:
                     try:
-                        stock_info = ak.stock_info_a_code_name()
-                        if stock_info is not None:
-                            # 搜索包含关键词的股票
-                            matched_stocks = stock_info[
-                                stock_info["name"].str.contains(
-                                    query, na=False, case=False
-                                )
-                            ].head(
-                                10
-                            )  # 限制返回10个结果
-
-                            for _, row in matched_stocks.iterrows():
-                                code = str(row["code"]).zfill(6)
-                                name = str(row["name"]).strip()
-                                results.append((code, name))
-                                logging.info(f"✅ 在线找到股票: {code} - {name}")
+                        # 搜索包含关键词的股票（限制返回10个结果）
+                        results.extend(_search_a_code_name(query, 10))
                     except Exception:
                         pass
 
             except Exception as e:
-                logging.warning(f"⚠️ AkShare在线搜索失败: {e}")
+                logging.warning("⚠️ AkShare在线搜索失败: %s", e)
 
-            return results[:10]  # 最多返回10个结果
+            results = results[:10]  # 最多返回10个结果
+            # 命中结果汇总记录一次，避免逐条格式化与加锁
+            if results and logging.getLogger().isEnabledFor(logging.INFO):
+                logging.info("✅ 在线找到股票: %s", results)
+            return results
 
         except Exception as e:
             logging.error(f"❌ 在线股票搜索失败: {e}")
@@ -5253,15 +6433,11 @@ class TradeDialog(QDialog):
         layout.addRow("操作:", QLabel(f"{mode_text}{action_text}"))
 
         # 交易方式选择
+        self._is_market = False  # 当前是否市价交易，交易方式改变时更新
         self.trade_type_combo = QComboBox()
-        if self.action == "buy":
-            self.trade_type_combo.addItems(
-                ["限价买入", "市价买入", "对手价买入", "本方价买入", "最优五档买入"]
-            )
-        else:
-            self.trade_type_combo.addItems(
-                ["限价卖出", "市价卖出", "对手价卖出", "本方价卖出", "最优五档卖出"]
-            )
+        suffix = "买入" if self.action == "buy" else "卖出"
+        for prefix, trade_kind in _TRADE_TYPE_ITEMS:
+            self.trade_type_combo.addItem(prefix + suffix, trade_kind)
         self.trade_type_combo.currentTextChanged.connect(self.on_trade_type_changed)
         layout.addRow("交易方式:", self.trade_type_combo)
 
@@ -5285,7 +6461,8 @@ class TradeDialog(QDialog):
 
         # 预估金额
         self.amount_label = QLabel("0.00 元")
-        self.amount_label.setStyleSheet("color: #666; font-weight: bold;")
+        self.amount_label.setStyleSheet(_STYLE_AMOUNT_IDLE)
+        self._last_style = _STYLE_AMOUNT_IDLE
         layout.addRow("预估金额:", self.amount_label)
 
         # 连接信号更新预估金额
@@ -5304,10 +6481,10 @@ class TradeDialog(QDialog):
 
     def on_trade_type_changed(self):
         """交易方式改变时的处理"""
-        trade_type = self.trade_type_combo.currentText()
+        self._is_market = self.trade_type_combo.currentData() == TradeType.MARKET
 
         # 市价交易隐藏价格输入
-        if "市价" in trade_type:
+        if self._is_market:
             self.price_spin.setVisible(False)
             self.price_label.setVisible(False)
             self.price_spin.setValue(0.0)
@@ -5324,31 +6501,86 @@ class TradeDialog(QDialog):
         quantity = self.quantity_spin.value()
         price = self.price_spin.value()
 
-        if "市价" in self.trade_type_combo.currentText():
+        if self._is_market:
             self.amount_label.setText("市价交易")
-            self.amount_label.setStyleSheet("color: #ff9800; font-weight: bold;")
+            style = _STYLE_AMOUNT_ORANGE
         else:
             amount = quantity * price
             self.amount_label.setText(f"{amount:.2f} 元")
 
             # 根据金额设置颜色
-            if amount > 50000:
-                self.amount_label.setStyleSheet(
-                    "color: #f44336; font-weight: bold;"
-                )  # 红色
-            elif amount > 10000:
-                self.amount_label.setStyleSheet(
-                    "color: #ff9800; font-weight: bold;"
-                )  # 橙色
-            else:
-                self.amount_label.setStyleSheet(
-                    "color: #4caf50; font-weight: bold;"
-                )  # 绿色
+            style = _STYLE_AMOUNT[bisect.bisect_left(_AMOUNT_THRESHOLDS, amount)]
+
+        # 样式未变化时不重复设置（setStyleSheet 会触发控件重新应用样式）
+        if style is not self._last_style:
+            self.amount_label.setStyleSheet(style)
+            self._last_style = style
 
     def get_trade_info(self) -> tuple:
-        """获取交易信息"""
+        """获取交易信息：(数量, 价格, 交易方式文本, TradeType)"""
         trade_type = self.trade_type_combo.currentText()
-        return self.quantity_spin.value(), self.price_spin.value(), trade_type
+        trade_kind = self.trade_type_combo.currentData()
+        return (
+            self.quantity_spin.value(),
+            self.price_spin.value(),
+            trade_type,
+            trade_kind,
+        )
+
+
+class TradeRecordModel(QAbstractTableModel):
+    """交易记录表格模型：直接持有记录字典列表，单元格文本在 data() 中按列格式化"""
+
+    HEADERS = ("时间", "股票代码", "股票名称", "操作", "价格", "数量", "金额", "类型")
+    _FMT = {
+        "价格": "{:.2f}".format,
+        "数量": str,
+        "金额": "{:.2f}".format,
+    }
+    _DEFAULTS = {"价格": 0, "数量": 0, "金额": 0}
+
+    def __init__(self, records=None, parent=None):
+        super().__init__(parent)
+        self._records = list(records or [])
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._records)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.HEADERS[section]
+        return super().headerData(section, orientation, role)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        record = self._records[index.row()]
+        key = self.HEADERS[index.column()]
+        if role == Qt.DisplayRole:
+            value = record.get(key, self._DEFAULTS.get(key, ""))
+            fmt = self._FMT.get(key)
+            return fmt(value) if fmt else value
+        if role == Qt.ForegroundRole and key == "类型":
+            # 类型列着色：模拟蓝色，实盘红色
+            return _COLOR_INFO if record.get("类型") == "模拟" else _COLOR_BAD
+        return None
+
+    def set_records(self, records):
+        """替换全部记录：行数不变时原地刷新单元格，避免重置视图"""
+        records = list(records)
+        if self._records and len(records) == len(self._records):
+            self._records = records
+            self.dataChanged.emit(
+                self.index(0, 0),
+                self.index(len(records) - 1, len(self.HEADERS) - 1),
+            )
+            return
+        self.beginResetModel()
+        self._records = records
+        self.endResetModel()
 
 
 class TradeRecordsDialog(QDialog):
@@ -5367,18 +6599,9 @@ class TradeRecordsDialog(QDialog):
         layout = QVBoxLayout(self)
 
         # 交易记录表格
-        self.records_table = QTableWidget()
-        headers = [
-            "时间",
-            "股票代码",
-            "股票名称",
-            "操作",
-            "价格",
-            "数量",
-            "金额",
-            "类型",
-        ]
-        self.records_table.setHorizontalHeaderLabels(headers)
+        self.records_model = TradeRecordModel(parent=self)
+        self.records_table = QTableView()
+        self.records_table.setModel(self.records_model)
         self.records_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
 
         # 加载记录
@@ -5393,35 +6616,7 @@ class TradeRecordsDialog(QDialog):
 
     def load_records(self):
         """加载交易记录"""
-        records = self.trade_recorder.get_records()
-        self.records_table.setRowCount(len(records))
-
-        for i, record in enumerate(records):
-            self.records_table.setItem(i, 0, QTableWidgetItem(record.get("时间", "")))
-            self.records_table.setItem(
-                i, 1, QTableWidgetItem(record.get("股票代码", ""))
-            )
-            self.records_table.setItem(
-                i, 2, QTableWidgetItem(record.get("股票名称", ""))
-            )
-            self.records_table.setItem(i, 3, QTableWidgetItem(record.get("操作", "")))
-            self.records_table.setItem(
-                i, 4, QTableWidgetItem(f"{record.get('价格', 0):.2f}")
-            )
-            self.records_table.setItem(
-                i, 5, QTableWidgetItem(str(record.get("数量", 0)))
-            )
-            self.records_table.setItem(
-                i, 6, QTableWidgetItem(f"{record.get('金额', 0):.2f}")
-            )
-
-            # 类型列着色
-            type_item = QTableWidgetItem(record.get("类型", ""))
-            if record.get("类型") == "模拟":
-                type_item.setForeground(QColor("blue"))
-            else:
-                type_item.setForeground(QColor("red"))
-            self.records_table.setItem(i, 7, type_item)
+        self.records_model.set_records(self.trade_recorder.get_records())
 
 
 # ================================
@@ -5437,11 +6632,30 @@ class ConfigInitThread(QThread):
         self.config = config
 
     def run(self):
-        """模拟配置加载过程"""
-        time.sleep(0.5)
+        """配置加载过程（配置已在主线程读入，直接通知完成，不再人为延时）"""
         self.init_complete.emit()
 
 
+class StockUniverseThread(QThread):
+    """股票列表加载线程：缓存 → MyQuant → AkShare → 本地文件 → 默认列表"""
+
+    loaded = pyqtSignal(dict)  # {code: name}
+
+    def __init__(self, loader, use_cache=True):
+        super().__init__()
+        self.loader = loader
+        self.use_cache = use_cache
+
+    def run(self):
+        """执行加载链，失败时返回空列表"""
+        try:
+            stocks = self.loader(self.use_cache)
+        except Exception as e:
+            logging.error(f"❌ 股票列表加载失败: {e}")
+            stocks = {}
+        self.loaded.emit(stocks)
+
+
 class ConnectionTestThread(QThread):
     """连接测试线程"""
 
@@ -5450,37 +6664,37 @@ class ConnectionTestThread(QThread):
     def __init__(self, config: Config):
         super().__init__()
         self.config = config
+        # Token 和账户ID 在创建时解析一次，测试线程直接使用
+        self._token, self._account_id = config.get_many(
+            ["myquant.token", "myquant.account_id"], ""
+        )
 
     def run(self):
         """执行连接测试"""
         try:
             # 设置超时，避免长时间卡死
-            import threading
-            import time
-
-            result = {"success": False, "message": "", "completed": False}
+            result = {"success": False, "message": ""}
+            completed = threading.Event()  # 工作线程结束时置位
 
             def test_worker():
                 try:
                     # 添加详细的测试步骤
                     client = MyQuantClient(self.config)
-                    # 加载配置中的Token和账户ID
-                    token = self.config.get("myquant.token", "")
-                    account_id = self.config.get("myquant.account_id", "")
+                    # 使用创建时解析的Token和账户ID
+                    token = self._token
+                    account_id = self._account_id
                     # 检查配置
                     if not token:
                         result["message"] = "Token为空，请检查配置"
-                        result["completed"] = True
                         return
                     if not account_id:
                         result["message"] = "账户ID为空，请检查配置"
-                        result["completed"] = True
                         return
                     # 设置到客户端
                     client.token = token
                     client.account_id = account_id
                     # 尝试连接
-                    if client.connect():
+                    if client.connect(force=True):
                         result["success"] = True
                         result["message"] = "MyQuant连接成功！"
                     else:
@@ -5488,25 +6702,20 @@ class ConnectionTestThread(QThread):
                         result["message"] = (
                             "MyQuant连接失败，请检查Token和账户ID是否正确"
                         )
-                    result["completed"] = True
 
                 except Exception as e:
                     result["success"] = False
                     result["message"] = f"连接测试异常: {str(e)}"
-                    result["completed"] = True
+                finally:
+                    completed.set()
 
             # 使用线程执行测试，设置超时
             test_thread = threading.Thread(target=test_worker)
             test_thread.daemon = True
             test_thread.start()
 
-            # 等待完成或超时
-            timeout_count = 0
-            while timeout_count < 50 and not result["completed"]:  # 最多等待5秒
-                time.sleep(0.1)
-                timeout_count += 1
-
-            if not result["completed"]:
+            # 等待完成或超时（最多5秒，完成即刻返回）
+            if not completed.wait(5.0):
                 result["success"] = False
                 result["message"] = "连接测试超时（5秒），可能网络较慢或配置有误"
 
@@ -5516,9 +6725,112 @@ class ConnectionTestThread(QThread):
             self.test_completed.emit(False, f"测试线程异常: {str(e)}")
 
 
+class SyncDataThread(QThread):
+    """客户端数据同步线程：持仓与账户查询并发执行，避免阻塞界面"""
+
+    sync_finished = pyqtSignal(int)  # 成功同步的项目数（持仓、账户）
+    sync_failed = pyqtSignal(str)  # 连接失败或异常信息
+
+    DEFAULT_ACCOUNT = {
+        "总资产": 0,
+        "可用资金": 0,
+        "持仓市值": 0,
+        "当日盈亏": 0,
+    }
+
+    def __init__(self, myquant_client: MyQuantClient, signals: SystemSignals):
+        super().__init__()
+        self.myquant_client = myquant_client
+        self.signals = signals
+
+    def run(self):
+        log = self.signals.log_message.emit
+        try:
+            # 检查客户端连接状态
+            if not self.myquant_client.is_connected():
+                log("客户端未连接，正在尝试重新连接...", "WARNING")
+                if not self.myquant_client.connect(force=True):
+                    log("客户端连接失败，无法同步数据", "ERROR")
+                    self.sync_failed.emit("客户端连接失败，请检查配置")
+                    return
+            else:
+                log("客户端连接正常", "INFO")
+
+            # 持仓与账户通过一次快照获取
+            log("正在同步持仓和账户信息...", "INFO")
+            snapshot = self.myquant_client.get_snapshot(force_refresh=True)
+            success_count = self._sync_positions(snapshot) + self._sync_account(
+                snapshot
+            )
+
+            self.sync_finished.emit(success_count)
+
+        except Exception as e:
+            log(f"同步客户端数据异常: {str(e)}", "ERROR")
+            self.sync_failed.emit(f"发生未预期的错误：\n{str(e)}")
+
+    def _sync_positions(self, snapshot: Dict) -> bool:
+        """分发快照中的持仓信息"""
+        log = self.signals.log_message.emit
+        error_msg = snapshot["errors"].get("positions")
+        if error_msg is not None:
+            if "无效的ACCOUNT_ID" in error_msg or "1020" in error_msg:
+                log("⚠️  持仓信息获取失败：账户权限不足或配置问题", "WARNING")
+                log("   可能需要在MyQuant平台开通相应权限", "INFO")
+            else:
+                log(f"❌ 持仓信息获取失败: {error_msg}", "ERROR")
+            # 设置空持仓
+            self.signals.positions_updated.emit([])
+            return False
+
+        positions = snapshot["positions"]
+        if positions and len(positions) > 0:
+            self.signals.positions_updated.emit(positions)
+            log(f"✅ 同步持仓信息成功，共{len(positions)}只股票", "SUCCESS")
+        else:
+            # 空持仓也算成功
+            self.signals.positions_updated.emit([])
+            log("✅ 持仓为空，已清空持仓表格", "INFO")
+        return True
+
+    def _sync_account(self, snapshot: Dict) -> bool:
+        """分发快照中的账户信息"""
+        log = self.signals.log_message.emit
+        error_msg = snapshot["errors"].get("account")
+        if error_msg is not None:
+            if "无效的ACCOUNT_ID" in error_msg or "1020" in error_msg:
+                log("⚠️  账户信息获取失败：账户权限不足或配置问题", "WARNING")
+                log("   可能需要在MyQuant平台开通交易权限", "INFO")
+            else:
+                log(f"❌ 账户信息获取失败: {error_msg}", "ERROR")
+            # 显示默认账户信息
+            self.signals.account_updated.emit(dict(self.DEFAULT_ACCOUNT))
+            return False
+
+        account = snapshot["account"]
+        if account and any(v != 0 for v in account.values()):
+            self.signals.account_updated.emit(account)
+            log("✅ 同步账户信息成功", "SUCCESS")
+            return True
+        # 显示默认的零账户信息
+        self.signals.account_updated.emit(dict(self.DEFAULT_ACCOUNT))
+        log("⚠️  账户信息为空或全为零", "WARNING")
+        return False
+
+
 class InitializationThread(QThread):
     """系统初始化线程 - 按照用户流程图优化版"""
 
+    # 客户端进程检测结果缓存：(检测时刻 monotonic, 是否运行)，重试时在有效期内复用
+    _GOLDMINER_TTL = 2.0
+    _goldminer_cache = (float("-inf"), False)
+    # 掘金终端主窗口标题：只作快速线索，须核实窗口所属进程的映像名后才确认运行
+    _GOLDMINER_WINDOW_TITLES = ("掘金终端", "掘金量化终端", "掘金3")
+    # 初始化步骤执行器：一个常驻守护线程依次执行各步骤（无需逐步骤新建线程）。
+    # 步骤超时或中止时该线程可能仍卡在 gm 调用中，此时弃用它，下个步骤换新线程
+    _step_lock = threading.Lock()
+    _step_tasks = None  # 当前工作线程的任务队列，None 表示需要新建
+
     def __init__(
         self,
         myquant_client: MyQuantClient,
@@ -5531,24 +6843,67 @@ class InitializationThread(QThread):
         self.signals = signals
         # 添加初始化状态标志
         self.initialization_completed = False
-        # 添加停止标志
-        self._stop_requested = False
+        # 停止事件：stop() 置位，等待中的步骤可立即醒来
+        self._stop_event = threading.Event()
 
     def stop(self):
         """请求停止初始化线程"""
-        self._stop_requested = True
+        self._stop_event.set()
         # 如果线程被阻塞，可以尝试中断，但要小心处理
         self.signals.log_message.emit("正在停止初始化...", "INFO")
 
     def is_goldminer_running(self) -> bool:
-        """检查goldminer3.exe进程是否运行"""
-        try:
-            import psutil
+        """检查goldminer3.exe进程是否运行（结果缓存 _GOLDMINER_TTL 秒）"""
+        checked_at, running = InitializationThread._goldminer_cache
+        now = time.monotonic()
+        if now - checked_at < self._GOLDMINER_TTL:
+            return running
+        running = self._probe_goldminer()
+        InitializationThread._goldminer_cache = (now, running)
+        return running
+
+    def _probe_goldminer(self) -> bool:
+        """实际检测进程：Windows 先查主窗口并核实所属进程，再用 tasklist 过滤，失败再遍历进程"""
+        if sys.platform == "win32":
+            try:
+                import ctypes
 
-            # 检查是否有goldminer3.exe进程在运行
-            for proc in psutil.process_iter(["name"]):
+                find_window = ctypes.windll.user32.FindWindowW
+                for title in self._GOLDMINER_WINDOW_TITLES:
+                    hwnd = find_window(None, title)
+                    # 同名窗口（如同名文件夹的资源管理器窗口）不算，须属于终端进程
+                    if hwnd and self._window_owner_is_goldminer(ctypes, hwnd):
+                        return True
+            except Exception:
+                pass
+
+            try:
+                import subprocess
+
+                output = subprocess.run(
+                    ["tasklist", "/FI", f"IMAGENAME eq {_GOLDMINER_NAME}", "/NH"],
+                    capture_output=True,
+                    text=True,
+                    timeout=3,
+                    creationflags=getattr(subprocess, "CREATE_NO_WINDOW", 0),
+                ).stdout
+                return _GOLDMINER_NAME in output.lower()
+            except Exception:
+                pass
+
+        if not PSUTIL_AVAILABLE:
+            # 如果没有安装psutil模块，无法遍历进程
+            self.signals.log_message.emit(
+                "⚠️ 未安装psutil模块，无法检查进程状态", "WARNING"
+            )
+            return False
+
+        try:
+            # 检查是否有goldminer3.exe进程在运行（只取 name 属性，按小写全名比较）
+            for proc in psutil.process_iter(attrs=["name"]):
                 try:
-                    if proc.info["name"] and "goldminer3.exe" in proc.info["name"]:
+                    name = proc.info["name"]
+                    if name and name.lower() == _GOLDMINER_NAME:
                         return True
                 except (
                     psutil.NoSuchProcess,
@@ -5556,69 +6911,103 @@ class InitializationThread(QThread):
                     psutil.ZombieProcess,
                 ):
                     pass
-            return False
-        except ImportError:
-            # 如果没有安装psutil模块，尝试其他方式检查
-            self.signals.log_message.emit(
-                "⚠️ 未安装psutil模块，无法检查进程状态", "WARNING"
-            )
+            # psutil>=6.0 会缓存进程列表，未找到时清理以免残留已退出的进程
+            cache_clear = getattr(psutil.process_iter, "cache_clear", None)
+            if cache_clear is not None:
+                cache_clear()
             return False
         except Exception as e:
             self.signals.log_message.emit(f"⚠️ 进程检查异常: {str(e)[:100]}", "WARNING")
             return False
 
-    def run(self):
-        """执行初始化流程 - 按照用户提供的流程图优化实现"""
+    @staticmethod
+    def _window_owner_is_goldminer(ctypes, hwnd) -> bool:
+        """窗口所属进程的映像名是否为掘金终端（无法查询时返回 False，交给进程检测）"""
+        user32 = ctypes.windll.user32
+        kernel32 = ctypes.windll.kernel32
+        pid = ctypes.c_ulong()
+        user32.GetWindowThreadProcessId(hwnd, ctypes.byref(pid))
+        # PROCESS_QUERY_LIMITED_INFORMATION
+        handle = kernel32.OpenProcess(0x1000, False, pid.value)
+        if not handle:
+            return False
         try:
-            # 定义每个步骤的超时处理函数
-            def execute_with_timeout(func, timeout, step_name, fail_message=""):
-                """执行函数并添加超时控制"""
-                import threading
-
-                result = [None]
-                exception = [None]
-                completed = threading.Event()
-
-                def target():
-                    try:
-                        result[0] = func()
-                        completed.set()
-                    except Exception as e:
-                        exception[0] = e
-                        completed.set()
+            size = ctypes.c_ulong(260)
+            path = ctypes.create_unicode_buffer(size.value)
+            if not kernel32.QueryFullProcessImageNameW(
+                handle, 0, path, ctypes.byref(size)
+            ):
+                return False
+            return os.path.basename(path.value).lower() == _GOLDMINER_NAME
+        finally:
+            kernel32.CloseHandle(handle)
+
+    @classmethod
+    def _submit_step(cls, func):
+        """把步骤交给常驻的步骤工作线程执行，返回 Future"""
+        future = Future()
+        with cls._step_lock:
+            tasks = cls._step_tasks
+            if tasks is None:
+                tasks = cls._step_tasks = queue.Queue()
+
+                def step_worker():
+                    # 被弃用（任务队列已替换）后处理完手头的步骤即退出
+                    while cls._step_tasks is tasks:
+                        task_future, task = tasks.get()
+                        try:
+                            task_future.set_result(task())
+                        except Exception as e:
+                            task_future.set_exception(e)
 
-                thread = threading.Thread(target=target)
+                # 守护线程：步骤卡死（如 gm RPC 无响应）时不阻塞程序退出
+                thread = threading.Thread(target=step_worker)
                 thread.daemon = True
                 thread.start()
+            tasks.put((future, func))
+        return future
+
+    @classmethod
+    def _abandon_step_worker(cls):
+        """弃用可能卡住的步骤工作线程，下个步骤会新建工作线程"""
+        with cls._step_lock:
+            cls._step_tasks = None
+
+    def _run_step(self, func, timeout, step_name, fail_message=""):
+        """在步骤工作线程中执行初始化步骤并限时等待，等待期间可被 stop() 中断"""
+        future = self._submit_step(func)
+
+        # 完成即返回；每 0.25 秒检查一次停止请求
+        deadline = time.monotonic() + timeout
+        while not self._stop_event.is_set():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            done, _ = wait((future,), timeout=min(remaining, 0.25))
+            if done:
+                break
 
-                # 等待超时或完成，同时检查是否收到停止请求
-                wait_start = time.time()
-                while (
-                    not completed.is_set()
-                    and time.time() - wait_start < timeout
-                    and not self._stop_requested
-                ):
-                    time.sleep(0.1)
-
-                # 检查是否超时或收到停止请求
-                if not completed.is_set():
-                    self.signals.log_message.emit(
-                        f"{step_name}超时（{timeout}秒）", "WARNING"
-                    )
-                    return False, None
-                elif self._stop_requested:
-                    self.signals.log_message.emit(f"{step_name}已中止", "INFO")
-                    return False, None
-                elif exception[0] is not None:
-                    # 限制错误信息长度，避免日志过长
-                    error_str = str(exception[0])[:200]
-                    self.signals.log_message.emit(
-                        f"{fail_message or step_name}失败: {error_str}", "WARNING"
-                    )
-                    return False, None
+        # 检查是否超时或收到停止请求
+        if not future.done():
+            self._abandon_step_worker()
+            self.signals.log_message.emit(f"{step_name}超时（{timeout}秒）", "WARNING")
+            return False, None
+        elif self._stop_event.is_set():
+            self.signals.log_message.emit(f"{step_name}已中止", "INFO")
+            return False, None
+        elif future.exception() is not None:
+            # 限制错误信息长度，避免日志过长
+            error_str = str(future.exception())[:200]
+            self.signals.log_message.emit(
+                f"{fail_message or step_name}失败: {error_str}", "WARNING"
+            )
+            return False, None
 
-                return True, result[0]
+        return True, future.result()
 
+    def run(self):
+        """执行初始化流程 - 按照用户提供的流程图优化实现"""
+        try:
             # 1. 加载交易池文件 (10%)
             self.signals.initialization_progress.emit(5, "加载交易池文件...")
 
@@ -5626,7 +7015,7 @@ class InitializationThread(QThread):
                 self.stock_pool.load_pool()
                 return len(self.stock_pool.stocks)
 
-            success, stock_count = execute_with_timeout(
+            success, stock_count = self._run_step(
                 load_pool_func,
                 3.0,  # 交易池加载超时设置为3秒
                 "交易池加载",
@@ -5640,7 +7029,7 @@ class InitializationThread(QThread):
                 self.signals.log_message.emit(
                     f"📊 交易池加载完成，共{stock_count}只股票", "INFO"
                 )
-            elif not self._stop_requested:
+            elif not self._stop_event.is_set():
                 self.signals.log_message.emit(
                     "⚠️ 交易池加载失败，使用空交易池继续", "WARNING"
                 )
@@ -5661,10 +7050,11 @@ class InitializationThread(QThread):
                 self.signals.log_message.emit(
                     "❌ 未检测到掘金终端(goldminer3.exe)运行", "WARNING"
                 )
-                # 发送掘金终端未运行信号
+                # 发送掘金终端未运行信号，等待提示窗口显示（最多0.5秒）
+                prompt_shown = self.signals.goldminer_prompt_shown
+                prompt_shown.clear()
                 self.signals.goldminer_not_running.emit()
-                # 等待短暂时间让提示窗口显示
-                time.sleep(0.5)
+                prompt_shown.wait(0.5)
                 # 在掘金终端未运行时，停止初始化流程
                 self.signals.initialization_progress.emit(0, "初始化已暂停")
                 self.signals.log_message.emit(
@@ -5674,11 +7064,8 @@ class InitializationThread(QThread):
                 return
 
             # 直接调用myquant_client的connect方法，它已经包含了超时控制
-            # 不再使用execute_with_timeout，避免双重线程和超时嵌套
+            # 不再经由 _run_step，避免双重线程和超时嵌套
             connected = self.myquant_client.connect()
-            success = connected
-
-            connected = success and connected
 
             # 检查是否连接成功，如果失败给出明确的失败原因
             if not connected:
@@ -5699,22 +7086,25 @@ class InitializationThread(QThread):
                 return
             self.signals.client_status_changed.emit(connected)
 
-            # 3. 获取持仓信息并验证连接 (50%)
+            # 3/4. 并发获取持仓与账户信息 (50%/70%)：两个查询共用一个超时
             positions = []
-            if connected and not self._stop_requested:
-                self.signals.initialization_progress.emit(40, "获取持仓信息...")
-
-                def get_positions_func():
-                    return self.myquant_client.get_positions()
-
-                success, positions = execute_with_timeout(
-                    get_positions_func,
-                    4.0,  # 获取持仓超时设置为4秒
-                    "获取持仓信息",
-                    "获取持仓信息",
+            account = None
+            if not self._stop_event.is_set():
+                self.signals.initialization_progress.emit(40, "获取持仓与账户信息...")
+
+                success, snapshot = self._run_step(
+                    self.myquant_client.get_snapshot,
+                    4.0,  # 持仓与账户并发查询，总超时4秒
+                    "获取持仓与账户信息",
+                    "获取持仓与账户信息",
                 )
+                if not success or snapshot is None:
+                    snapshot = {"positions": [], "account": None, "errors": {}}
+                positions = snapshot["positions"] or []
+                if "account" not in snapshot["errors"]:
+                    account = snapshot["account"]
 
-                if success and positions is not None and len(positions) > 0:
+                if positions:
                     self.signals.positions_updated.emit(positions)
                     self.signals.initialization_progress.emit(
                         50, f"获取到{len(positions)}只持仓股票"
@@ -5724,84 +7114,51 @@ class InitializationThread(QThread):
                     )
                 else:
                     # 持仓为空也可能是正常的，继续后续步骤
-                    positions = []
                     self.signals.positions_updated.emit([])
                     self.signals.initialization_progress.emit(50, "持仓信息获取完成")
                     self.signals.log_message.emit("📊 当前无持仓股票", "INFO")
 
-            # 如果连接失败，提供明确的提示信息
-            if not connected or self._stop_requested:
-                if not self._stop_requested:
-                    self.signals.log_message.emit(
-                        "❌ 初始化失败：无法连接MyQuant", "ERROR"
-                    )
-                    self.signals.log_message.emit("💡 解决方案：", "INFO")
-                    self.signals.log_message.emit(
-                        "  • 确保掘金终端(goldminer3.exe)已启动", "INFO"
-                    )
-                    self.signals.log_message.emit(
-                        "  • 在设置中验证Token和账户ID是否正确", "INFO"
-                    )
-                    self.signals.log_message.emit("  • 检查网络连接是否正常", "INFO")
-                    self.signals.log_message.emit(
-                        "  • 点击'初始化系统'按钮重试", "INFO"
-                    )
-                    self.signals.status_message.emit("客户端未启动/连接失败")
-                # 即使连接失败，也要标记为完成，避免主线程卡死
+            # 收到停止请求时结束初始化
+            if self._stop_event.is_set():
+                # 也要标记为完成，避免主线程卡死
                 self.initialization_completed = True
                 return
 
-            # 4. 获取账户信息 (70%)
-            if not self._stop_requested:
-                self.signals.initialization_progress.emit(60, "获取账户信息...")
-
-                def get_account_func():
-                    return self.myquant_client.get_account_info()
-
-                success, account = execute_with_timeout(
-                    get_account_func,
-                    4.0,  # 获取账户信息超时设置为4秒
-                    "获取账户信息",
-                    "获取账户信息",
+            if account is not None:
+                self.signals.account_updated.emit(account)
+                self.signals.initialization_progress.emit(70, "账户信息获取完成")
+                self.signals.log_message.emit(
+                    f"💰 账户总资产: {account.get('总资产', 0):.2f}元", "INFO"
                 )
-
-                if success and account is not None:
-                    self.signals.account_updated.emit(account)
-                    self.signals.initialization_progress.emit(70, "账户信息获取完成")
-                    self.signals.log_message.emit(
-                        f"💰 账户总资产: {account.get('总资产', 0):.2f}元", "INFO"
-                    )
-                else:
-                    account = {}
-                    self.signals.log_message.emit(
-                        "⚠️ 账户信息获取失败，使用默认值", "WARNING"
-                    )
             else:
                 account = {}
+                self.signals.log_message.emit(
+                    "⚠️ 账户信息获取失败，使用默认值", "WARNING"
+                )
 
             # 5. 将持仓股票添加到交易池 (90%)
-            if not self._stop_requested and positions:
+            if not self._stop_event.is_set() and positions:
                 self.signals.initialization_progress.emit(80, "更新交易池...")
 
                 def update_pool_func():
                     if positions:
                         self.stock_pool.add_position_stocks(positions)
 
-                execute_with_timeout(
+                self._run_step(
                     update_pool_func,
                     3.0,  # 更新交易池超时设置为3秒
                     "更新交易池",
                     "更新交易池",
                 )
 
-                if not self._stop_requested:
+                if not self._stop_event.is_set():
                     self.signals.initialization_progress.emit(90, "交易池更新完成")
                     self.signals.log_message.emit(
                         "🔄 交易池已更新，持仓股票已添加", "INFO"
                     )
 
             # 6. 检查历史数据 (95%)
-            if not self._stop_requested:
+            if not self._stop_event.is_set():
                 self.signals.initialization_progress.emit(95, "检查历史数据...")
                 # TODO: 实现历史数据完整性检查
                 # 这里可以添加历史数据检查逻辑
@@ -5810,7 +7167,7 @@ class InitializationThread(QThread):
 
             # 7. 显示交易池第一只股票的图表
             if (
-                not self._stop_requested
+                not self._stop_event.is_set()
                 and hasattr(self.stock_pool, "stocks")
                 and self.stock_pool.stocks
             ):
@@ -5822,7 +7179,7 @@ class InitializationThread(QThread):
                 # 注意：实际的图表显示逻辑应该在MainWindow中实现
 
             # 只有在未收到停止请求时才标记为成功完成
-            if not self._stop_requested:
+            if not self._stop_event.is_set():
                 self.signals.initialization_progress.emit(100, "初始化完成")
                 self.signals.log_message.emit("✅ 系统初始化成功完成", "SUCCESS")
                 self.signals.status_message.emit("初始化完成")
@@ -5857,6 +7214,40 @@ class InitializationThread(QThread):
 # ================================# 主程序入口# ================================
 
 
+# 应用全局样式表（模块级常量，导入时构建一次）
+_APP_QSS = """
+    QMainWindow {
+        background-color: #f5f5f5;
+    }
+    QGroupBox {
+        font-weight: bold;
+        border: 2px solid #cccccc;
+        border-radius: 5px;
+        margin-top: 1ex;
+        padding-top: 10px;
+    }
+    QGroupBox::title {
+        subcontrol-origin: margin;
+        left: 10px;
+        padding: 0 5px 0 5px;
+    }
+    QPushButton {
+        background-color: #4CAF50;
+        color: white;
+        border: none;
+        padding: 8px 16px;
+        border-radius: 4px;
+        font-weight: bold;
+    }
+    QPushButton:hover {
+        background-color: #45a049;
+    }
+    QPushButton:pressed {
+        background-color: #3d8b40;
+    }
+"""
+
+
 def main():
     """主程序入口"""
     # 配置日志
@@ -5875,39 +7266,7 @@ def main():
     app.setApplicationVersion("2.0")
 
     # 设置应用样式
-    app.setStyleSheet(
-        """
-        QMainWindow {
-            background-color: #f5f5f5;
-        }
-        QGroupBox {
-            font-weight: bold;
-            border: 2px solid #cccccc;
-            border-radius: 5px;
-            margin-top: 1ex;
-            padding-top: 10px;
-        }
-        QGroupBox::title {
-            subcontrol-origin: margin;
-            left: 10px;
-            padding: 0 5px 0 5px;
-        }
-        QPushButton {
-            background-color: #4CAF50;
-            color: white;
-            border: none;
-            padding: 8px 16px;
-            border-radius: 4px;
-            font-weight: bold;
-        }
-        QPushButton:hover {
-            background-color: #45a049;
-        }
-        QPushButton:pressed {
-            background-color: #3d8b40;
-        }
-    """
-    )
+    app.setStyleSheet(_APP_QSS)
 
     # 创建主窗口
     main_window = MainWindow()
@@ -5929,7 +7288,14 @@ class SimpleHistoricalDataDialog(QDialog):
 
         self.setWindowTitle("历史数据下载")
         self.setFixedSize(600, 400)
-        self.init_ui()
+
+        # 构建期间关闭刷新，控件全部加入后一次性计算布局
+        self.setUpdatesEnabled(False)
+        try:
+            self.init_ui()
+            self.layout().activate()
+        finally:
+            self.setUpdatesEnabled(True)
 
     def init_ui(self):
         """初始化界面"""
@@ -6003,9 +7369,12 @@ class SimpleHistoricalDataDialog(QDialog):
         layout.addLayout(button_layout)
 
     def add_log(self, message):
-        """添加日志消息"""
-        timestamp = datetime.now().strftime("%H:%M:%S")
-        self.log_text.append(f"[{timestamp}] {message}")
+        """添加日志消息（下载线程可能一次发来多行，合并为一次 append）"""
+        t = time.localtime()
+        timestamp = f"{t.tm_hour:02d}:{t.tm_min:02d}:{t.tm_sec:02d}"
+        self.log_text.append(
+            "\n".join(f"[{timestamp}] {line}" for line in message.split("\n"))
+        )
 
     def start_download(self):
         """开始下载"""
@@ -6063,60 +7432,309 @@ class SimpleHistoricalDataDialog(QDialog):
 
 
 class SimpleDownloadThread(QThread):
-    """简化的下载线程"""
+    """简化的下载线程：多个请求并发在途，按固定速率限流发起"""
 
     progress_updated = pyqtSignal(int, int, str)  # current, total, message
     log_message = pyqtSignal(str)
     download_finished = pyqtSignal(int, int)  # success_count, total_count
 
+    _MAX_WORKERS = 8  # 同时在途的请求数
+    _MIN_INTERVAL = 0.2  # 相邻请求的最小发起间隔（秒），避免请求过于频繁
+    _EMIT_INTERVAL = 0.1  # 进度/日志信号的最小发送间隔（秒），期间日志攒批
+
     def __init__(self, client, symbols, period, count):
         super().__init__()
         self.client = client
         self.symbols = symbols
         self.period = period
         self.count = count
-        self.cancelled = False
+        self.cancel_event = threading.Event()
+        self._rate_lock = threading.Lock()
+        self._next_slot = 0.0
+        self._pending_logs = []
+        self._last_progress_emit = float("-inf")
 
     def cancel(self):
-        """取消下载"""
-        self.cancelled = True
+        """取消下载（限速等待中的请求立即醒来并放弃）"""
+        self.cancel_event.set()
+
+    def _wait_rate_slot(self) -> bool:
+        """为每个请求分配发起时刻，超出速率的请求在此等待；返回是否已取消"""
+        with self._rate_lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self._MIN_INTERVAL
+        if slot > now:
+            return self.cancel_event.wait(slot - now)
+        return self.cancel_event.is_set()
+
+    def _flush(self, done, total_count, message, force=False):
+        """节流发送进度与攒批的日志（多行合并为一次信号）"""
+        now = time.monotonic()
+        if not force and now - self._last_progress_emit <= self._EMIT_INTERVAL:
+            return
+        self._last_progress_emit = now
+        self.progress_updated.emit(done, total_count, message)
+        if self._pending_logs:
+            self.log_message.emit("\n".join(self._pending_logs))
+            self._pending_logs.clear()
+
+    def _download(self, symbol):
+        """工作线程：限速后下载单只股票，已取消则返回 None"""
+        if self.cancel_event.is_set() or self._wait_rate_slot():
+            return None
+        return self.client.get_historical_data(symbol, self.period, self.count)
 
     def run(self):
         """执行下载"""
         success_count = 0
         total_count = len(self.symbols)
+        done = 0
+        message = ""
 
-        for i, symbol in enumerate(self.symbols):
-            if self.cancelled:
-                break
+        with ThreadPoolExecutor(max_workers=self._MAX_WORKERS) as pool:
+            futures = {
+                pool.submit(self._download, symbol): symbol for symbol in self.symbols
+            }
+            # 按完成顺序汇报进度；done 只计已处理完的请求，取消时不含被放弃的那一个
+            for future in as_completed(futures):
+                if self.cancel_event.is_set():
+                    for pending in futures:
+                        pending.cancel()
+                    break
 
-            self.progress_updated.emit(i, total_count, f"下载 {symbol}")
+                symbol = futures[future]
+                message = f"已下载 {symbol}"
+                logs = self._pending_logs
 
-            try:
-                # 下载数据
-                df = self.client.get_historical_data(symbol, self.period, self.count)
+                try:
+                    df = future.result()
 
-                if not df.empty:
-                    success_count += 1
-                    self.log_message.emit(f"✅ {symbol} 下载成功 ({len(df)} 条记录)")
-                else:
-                    self.log_message.emit(f"⚠️ {symbol} 无数据")
+                    if df is not None and not df.empty:
+                        success_count += 1
+                        logs.append(f"✅ {symbol} 下载成功 ({len(df)} 条记录)")
+                    else:
+                        logs.append(f"⚠️ {symbol} 无数据")
 
-            except Exception as e:
-                self.log_message.emit(f"❌ {symbol} 下载失败: {e}")
+                except Exception as e:
+                    logs.append(f"❌ {symbol} 下载失败: {e}")
 
-            # 延迟以避免请求过于频繁
-            self.msleep(200)
+                done += 1
+                self._flush(done, total_count, message)
 
+        # 结束前把剩余进度与日志发出
+        self._flush(done, total_count, message, force=True)
         self.download_finished.emit(success_count, total_count)
 
 
+# 委托时间解析（预绑定 datetime.strptime，逐行格式化时免去属性查找）
+_strptime = datetime.strptime
+
+# 服务端已知的委托时间格式：(最短长度, ((位置, 允许的分隔符), ...), 时分秒起点)
+_KNOWN_TIME_LAYOUTS = (
+    # "YYYY-MM-DD HH:MM:SS" / "YYYY-MM-DDTHH:MM:SS" / "YYYY/MM/DD HH:MM:SS"
+    (19, ((4, "-/"), (10, " T"), (13, ":"), (16, ":")), 11),
+    # "YYYYMMDD HH:MM:SS"
+    (17, ((8, " "), (11, ":"), (14, ":")), 9),
+    # "HH:MM:SS"
+    (8, ((2, ":"), (5, ":")), 0),
+)
+
+
+def _extract_hms(text):
+    """从委托时间字符串中取出 "HH:MM:SS"
+
+    已知格式按固定位置直接切片，只有未知格式才交给 strptime；无法解析时返回 None
+    """
+    n = len(text)
+    for min_len, checks, start in _KNOWN_TIME_LAYOUTS:
+        if n >= min_len and all(text[pos] in seps for pos, seps in checks):
+            return text[start : start + 8]
+    try:
+        return _strptime(text[:19], "%Y-%m-%d %H:%M:%S").strftime("%H:%M:%S")
+    except ValueError:
+        return None
+
+
+# 订单状态码 → 文本
+_ORDER_STATUS_MAP = {
+    1: "未成交",
+    2: "部分成交",
+    3: "已成交",
+    4: "已撤销",
+    5: "部分撤销",
+    6: "已拒绝",
+    7: "待报",
+    8: "废单",
+    9: "部分废单",
+}
+# 可撤销（未成交、部分成交）与可删除记录（已拒绝、废单、部分废单）的状态码
+_CANCELLABLE_STATUSES = frozenset({1, 2})
+_DELETABLE_STATUSES = frozenset({6, 8, 9})
+
+
+class OrdersModel(QAbstractTableModel):
+    """订单表格模型：持有订单字典列表，载入时每行一次取字段并格式化为文本元组
+
+    时间列保存原始 created_at，首次显示时才格式化为时分秒并缓存
+    """
+
+    HEADERS = ("订单ID", "股票代码", "股票名称", "方向", "数量", "价格", "状态", "时间")
+    STATUS_COLUMN = 6
+    TIME_COLUMN = 7
+    _SIDE_MAP = {1: "买入", 2: "卖出"}
+    # 状态背景色：每种颜色只构造一次，同色状态共用同一对象
+    _BG_YELLOW = QColor("#fff3cd")
+    _BG_GREEN = QColor("#d4edda")
+    _BG_RED = QColor("#f8d7da")
+    _BG_GRAY = QColor("#e2e3e5")
+    _BG_DARKRED = QColor("#f1c0c7")
+    _STATUS_COLORS = {
+        1: _BG_YELLOW,  # 未成交
+        2: _BG_YELLOW,  # 部分成交
+        3: _BG_GREEN,  # 已成交
+        4: _BG_RED,  # 已撤销
+        5: _BG_RED,  # 部分撤销
+        6: _BG_RED,  # 已拒绝
+        7: _BG_GRAY,  # 待报
+        8: _BG_DARKRED,  # 废单
+        9: _BG_DARKRED,  # 部分废单
+    }
+
+    def __init__(self, status_text, parent=None):
+        super().__init__(parent)
+        self._orders = []
+        self._rows = []  # 与 _orders 一一对应的显示文本元组（时间列为原始值）
+        self._times = []  # 时间列的显示文本，None 表示尚未格式化
+        self.status_counts = Counter()  # 载入时顺带统计：状态文本 → 订单数
+        self._status_text = status_text  # 状态码 → 文本
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._orders)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.HEADERS[section]
+        return super().headerData(section, orientation, role)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        row = index.row()
+        column = index.column()
+        if role == Qt.DisplayRole:
+            if column == self.TIME_COLUMN:
+                return self._time_text(row)
+            return self._rows[row][column]
+        if role == Qt.BackgroundRole and column == self.STATUS_COLUMN:
+            return self._STATUS_COLORS.get(self._orders[row].get("status", ""))
+        return None
+
+    def _format_row(self, order):
+        """一次取出订单字段并格式化为整行文本"""
+        get = order.get
+        symbol = get("symbol", "")
+        order_id = get("cl_ord_id") or get("order_id") or ""
+        side = get("side", "")
+        price = get("price", 0)
+        return (
+            str(order_id),
+            symbol,
+            get("name") or symbol,
+            self._SIDE_MAP.get(side) or str(side),
+            str(get("volume", 0)),
+            f"{price:.2f}" if price > 0 else "市价",
+            self._status_text(get("status", "")),
+            get("created_at", ""),
+        )
+
+    @staticmethod
+    def format_time(created_at):
+        """委托时间只显示时分秒，无法识别的格式原样显示"""
+        if not created_at:
+            return ""
+        if isinstance(created_at, datetime):
+            # gm SDK 返回 datetime 对象
+            return created_at.strftime("%H:%M:%S")
+        if not isinstance(created_at, str):
+            return str(created_at)
+        return _extract_hms(created_at) or created_at
+
+    def _time_text(self, row):
+        """取某行时间列的显示文本，只在首次访问时格式化"""
+        text = self._times[row]
+        if text is None:
+            text = self._times[row] = self.format_time(self._rows[row][-1])
+        return text
+
+    def set_orders(self, orders):
+        """替换全部订单"""
+        self.beginResetModel()
+        self._orders = list(orders or [])
+        format_row = self._format_row
+        status_column = self.STATUS_COLUMN
+        rows = []
+        status_counts = Counter()
+        # 格式化与状态统计在同一遍完成
+        for order in self._orders:
+            row = format_row(order)
+            rows.append(row)
+            status_counts[row[status_column]] += 1
+        self._rows = rows
+        self._times = [None] * len(rows)
+        self.status_counts = status_counts
+        self.endResetModel()
+
+    def cell_text(self, row, column):
+        """取某行某列的显示文本"""
+        if column == self.TIME_COLUMN:
+            return self._time_text(row)
+        return self._rows[row][column]
+
+    def status(self, row):
+        """取某行订单的状态码"""
+        return self._orders[row].get("status")
+
+    def row_texts(self, row):
+        """取某行全部列的显示文本（与 HEADERS 对应）"""
+        return self._rows[row][:-1] + (self._time_text(row),)
+
+    def set_status(self, row, status):
+        """更新某行订单状态（撤单成功后就地刷新）"""
+        self.update_order(row, {**self._orders[row], "status": status})
+
+    def update_order(self, row, order):
+        """用新的订单数据替换一行，只刷新该行"""
+        self._orders[row] = order
+        self._rows[row] = self._format_row(order)
+        self._times[row] = None
+        last_column = len(self.HEADERS) - 1
+        self.dataChanged.emit(self.index(row, 0), self.index(row, last_column))
+
+    def remove_row(self, row):
+        """从列表中移除一行"""
+        self.beginRemoveRows(QModelIndex(), row, row)
+        del self._orders[row]
+        del self._rows[row]
+        del self._times[row]
+        self.endRemoveRows()
+
+
 class OrdersDialog(QDialog):
     """订单查询对话框"""
 
     def __init__(self, myquant_client, parent=None):
         super().__init__(parent)
         self.myquant_client = myquant_client
+        self._unfinished_view = False  # 当前显示的是否为未完成订单
+        # 撤单/删除确认框只构造一次，每次确认时仅更新标题和内容
+        self._confirm_box = QMessageBox(self)
+        self._confirm_box.setIcon(QMessageBox.Question)
+        self._confirm_box.setStandardButtons(QMessageBox.Yes | QMessageBox.No)
+        self._confirm_box.setDefaultButton(QMessageBox.No)
         self.init_ui()
         self.load_orders()
 
@@ -6156,11 +7774,9 @@ class OrdersDialog(QDialog):
         layout.addLayout(button_layout)
 
         # 订单表格
-        self.orders_table = QTableWidget()
-        self.orders_table.setColumnCount(8)
-        self.orders_table.setHorizontalHeaderLabels(
-            ["订单ID", "股票代码", "股票名称", "方向", "数量", "价格", "状态", "时间"]
-        )
+        self.orders_model = OrdersModel(self.get_status_text, parent=self)
+        self.orders_table = QTableView()
+        self.orders_table.setModel(self.orders_model)
 
         # 设置表格样式
         header = self.orders_table.horizontalHeader()
@@ -6174,12 +7790,15 @@ class OrdersDialog(QDialog):
         header.resizeSection(6, 80)  # 状态
         header.resizeSection(7, 150)  # 时间
 
+        # 固定行高：视图不再逐行查询尺寸，只为可见行调用 data()
+        self.orders_table.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
         self.orders_table.setAlternatingRowColors(True)
-        self.orders_table.setSelectionBehavior(QTableWidget.SelectRows)
+        self.orders_table.setSelectionBehavior(QTableView.SelectRows)
 
         # 添加右键菜单
         self.orders_table.setContextMenuPolicy(Qt.CustomContextMenu)
         self.orders_table.customContextMenuRequested.connect(self.show_context_menu)
+        self._init_context_menu()
 
         layout.addWidget(self.orders_table)
 
@@ -6208,6 +7827,7 @@ class OrdersDialog(QDialog):
 
             # 获取订单列表
             orders = self.myquant_client.get_orders()
+            self._unfinished_view = False
             self.display_orders(orders, "所有订单")
 
         except Exception as e:
@@ -6231,6 +7851,7 @@ class OrdersDialog(QDialog):
 
             # 获取未完成订单列表
             orders = self.myquant_client.get_unfinished_orders()
+            self._unfinished_view = True
             self.display_orders(orders, "未完成订单")
 
         except Exception as e:
@@ -6241,175 +7862,121 @@ class OrdersDialog(QDialog):
 
     def display_orders(self, orders, order_type):
         """显示订单列表"""
+        # 重置模型期间暂停表格刷新，载入完成后只重绘一次
+        self.orders_table.setUpdatesEnabled(False)
+        try:
+            self.orders_model.set_orders(orders)
+        finally:
+            self.orders_table.setUpdatesEnabled(True)
         if not orders:
-            self.orders_table.setRowCount(0)
             self.status_label.setText(f"📋 {order_type}: 暂无数据")
             return
 
-        self.orders_table.setRowCount(len(orders))
-
-        for i, order in enumerate(orders):
-            # 订单ID
-            order_id = order.get("cl_ord_id", "") or order.get("order_id", "")
-            self.orders_table.setItem(i, 0, QTableWidgetItem(str(order_id)))
-
-            # 股票代码
-            symbol = order.get("symbol", "")
-            self.orders_table.setItem(i, 1, QTableWidgetItem(symbol))
-
-            # 股票名称 (如果有的话)
-            name = order.get("name", "") or symbol
-            self.orders_table.setItem(i, 2, QTableWidgetItem(name))
-
-            # 买卖方向
-            side = order.get("side", "")
-            direction = "买入" if side == 1 else "卖出" if side == 2 else str(side)
-            self.orders_table.setItem(i, 3, QTableWidgetItem(direction))
-
-            # 数量
-            volume = order.get("volume", 0)
-            self.orders_table.setItem(i, 4, QTableWidgetItem(str(volume)))
-
-            # 价格
-            price = order.get("price", 0)
-            price_str = f"{price:.2f}" if price > 0 else "市价"
-            self.orders_table.setItem(i, 5, QTableWidgetItem(price_str))
-
-            # 状态
-            status = order.get("status", "")
-            status_text = self.get_status_text(status)
-            item = QTableWidgetItem(status_text)
-
-            # 根据状态设置颜色
-            if status in [1, 2]:  # 未成交、部分成交
-                item.setBackground(QColor("#fff3cd"))  # 黄色背景
-            elif status == 3:  # 已成交
-                item.setBackground(QColor("#d4edda"))  # 绿色背景
-            elif status in [4, 5, 6]:  # 已撤销、部分撤销、已拒绝
-                item.setBackground(QColor("#f8d7da"))  # 红色背景
-            elif status == 7:  # 待报
-                item.setBackground(QColor("#e2e3e5"))  # 灰色背景
-            elif status in [8, 9]:  # 废单、部分废单
-                item.setBackground(QColor("#f1c0c7"))  # 深红色背景
-
-            self.orders_table.setItem(i, 6, item)
-
-            # 时间
-            created_at = order.get("created_at", "")
-            if created_at:
-                # 格式化时间显示
-                import datetime
-
-                try:
-                    if isinstance(created_at, str):
-                        # 假设时间格式为 "2025-01-27 09:30:00"
-                        dt = datetime.datetime.strptime(
-                            created_at[:19], "%Y-%m-%d %H:%M:%S"
-                        )
-                        time_str = dt.strftime("%H:%M:%S")
-                    else:
-                        time_str = str(created_at)
-                except Exception:
-                    time_str = str(created_at)
-            else:
-                time_str = ""
-            self.orders_table.setItem(i, 7, QTableWidgetItem(time_str))
-
-        # 统计各状态的订单数量
-        status_counts = {}
-        for order in orders:
-            status = order.get("status", 0)
-            status_text = self.get_status_text(status)
-            status_counts[status_text] = status_counts.get(status_text, 0) + 1
+        # 各状态的订单数量（模型载入时已统计）
+        status_counts = self.orders_model.status_counts
 
         # 生成状态统计文本
-        status_stats = []
-        for status_text, count in status_counts.items():
-            status_stats.append(f"{status_text}:{count}")
-
-        stats_text = " | ".join(status_stats) if status_stats else "无数据"
+        stats_text = (
+            " | ".join(f"{text}:{count}" for text, count in status_counts.items())
+            or "无数据"
+        )
         self.status_label.setText(
             f"📋 {order_type}: 共 {len(orders)} 条记录 [{stats_text}]"
         )
 
     def get_status_text(self, status):
         """获取状态文本"""
-        status_map = {
-            1: "未成交",
-            2: "部分成交",
-            3: "已成交",
-            4: "已撤销",
-            5: "部分撤销",
-            6: "已拒绝",
-            7: "待报",
-            8: "废单",
-            9: "部分废单",
-        }
-        return status_map.get(status, f"状态{status}")
+        # 字典查找对 numpy 整数等与 int 等值的状态码同样有效
+        return _ORDER_STATUS_MAP.get(status, f"状态{status}")
+
+    def _init_context_menu(self):
+        """右键菜单与菜单项只构建一次，弹出时按订单状态挑选菜单项"""
+        self._context_menu = QMenu(self)
+        self._menu_row = -1
+        self._menu_order_id = ""
+
+        self._cancel_action = QAction("❌ 撤销订单", self)
+        self._cancel_action.triggered.connect(
+            lambda: self.cancel_order(self._menu_order_id, self._menu_row)
+        )
+        self._delete_action = QAction("🗑️ 删除记录", self)
+        self._delete_action.triggered.connect(
+            lambda: self.delete_order_record(self._menu_row)
+        )
+        self._detail_action = QAction("📋 查看详情", self)
+        self._detail_action.triggered.connect(
+            lambda: self.show_order_detail(self._menu_row)
+        )
+        self._refresh_action = QAction("🔄 刷新状态", self)
+        self._refresh_action.triggered.connect(
+            lambda: self.refresh_order_row(self._menu_order_id, self._menu_row)
+        )
 
     def show_context_menu(self, position):
         """显示右键菜单"""
         # 获取点击位置的行
-        item = self.orders_table.itemAt(position)
-        if not item:
+        index = self.orders_table.indexAt(position)
+        if not index.isValid():
             return
 
-        current_row = item.row()
-        self.orders_table.selectRow(current_row)  # 选中这一行
-
-        # 获取选中的订单信息
-        order_id_item = self.orders_table.item(current_row, 0)
-        status_item = self.orders_table.item(current_row, 6)
-
-        if not order_id_item or not status_item:
-            return
+        current_row = index.row()
+        # 选中这一行：已是当前选中行时不再触发选择变化
+        selection_model = self.orders_table.selectionModel()
+        if not selection_model.isRowSelected(current_row, QModelIndex()):
+            selection_model.setCurrentIndex(
+                index, QItemSelectionModel.ClearAndSelect | QItemSelectionModel.Rows
+            )
 
-        order_id = order_id_item.text()
-        status_text = status_item.text()
+        # 记录菜单作用的订单，菜单项的槽函数从这里读取
+        self._menu_row = current_row
+        self._menu_order_id = self.orders_model.cell_text(current_row, 0)
+        status = self.orders_model.status(current_row)
 
-        # 创建右键菜单
-        menu = QMenu(self)
+        # 复用右键菜单，只重新挑选菜单项（菜单项归对话框所有，clear 不会删除）
+        menu = self._context_menu
+        menu.clear()
 
         # 根据订单状态决定可用操作
-        if status_text in ["未成交", "部分成交"]:
+        if status in _CANCELLABLE_STATUSES:
             # 可以撤销的订单
-            cancel_action = QAction("❌ 撤销订单", self)
-            cancel_action.triggered.connect(
-                lambda: self.cancel_order(order_id, current_row)
-            )
-            menu.addAction(cancel_action)
-        elif status_text in ["已拒绝", "废单", "部分废单"]:
+            menu.addAction(self._cancel_action)
+        elif status in _DELETABLE_STATUSES:
             # 被拒绝的订单或废单可以删除（从显示中移除）
-            delete_action = QAction("🗑️ 删除记录", self)
-            delete_action.triggered.connect(
-                lambda: self.delete_order_record(current_row)
-            )
-            menu.addAction(delete_action)
+            menu.addAction(self._delete_action)
 
-        # 查看详情（所有订单都可以）
-        detail_action = QAction("📋 查看详情", self)
-        detail_action.triggered.connect(lambda: self.show_order_detail(current_row))
-        menu.addAction(detail_action)
-
-        # 刷新订单状态
-        refresh_action = QAction("🔄 刷新状态", self)
-        refresh_action.triggered.connect(self.load_orders)
-        menu.addAction(refresh_action)
+        # 查看详情（所有订单都可以）、刷新订单状态
+        menu.addAction(self._detail_action)
+        menu.addAction(self._refresh_action)
 
         # 显示菜单
         menu.exec_(self.orders_table.mapToGlobal(position))
 
+    def refresh_order_row(self, order_id, row):
+        """只刷新一行订单的状态；查不到该订单时按当前视图整表刷新"""
+        try:
+            order = self.myquant_client.get_order(
+                order_id, unfinished_only=self._unfinished_view
+            )
+        except Exception as e:
+            self.status_label.setText(f"❌ 刷新失败: {str(e)}")
+            return
+        if order is not None:
+            self.orders_model.update_order(row, order)
+        elif self._unfinished_view:
+            # 订单已不在未完成列表中（已成交/撤销），重新载入未完成订单
+            self.load_unfinished_orders()
+        else:
+            self.load_orders()
+
+    def _confirm(self, title, text):
+        """复用同一个确认框，返回用户是否确认"""
+        self._confirm_box.setWindowTitle(title)
+        self._confirm_box.setText(text)
+        return self._confirm_box.exec_() == QMessageBox.Yes
+
     def cancel_order(self, order_id, row):
         """撤销订单"""
-        reply = QMessageBox.question(
-            self,
-            "撤销订单",
-            f"确定要撤销订单吗？\n\n订单ID: {order_id}",
-            QMessageBox.Yes | QMessageBox.No,
-            QMessageBox.No,
-        )
-
-        if reply == QMessageBox.Yes:
+        if self._confirm("撤销订单", f"确定要撤销订单吗？\n\n订单ID: {order_id}"):
             try:
                 result = self.myquant_client.cancel_order(order_id)
 
@@ -6417,11 +7984,8 @@ class OrdersDialog(QDialog):
                     QMessageBox.information(
                         self, "撤销成功", f"✅ 订单撤销成功！\n\n订单ID: {order_id}"
                     )
-                    # 更新表格中的状态
-                    status_item = self.orders_table.item(row, 6)
-                    if status_item:
-                        status_item.setText("已撤销")
-                        status_item.setBackground(QColor("#f8d7da"))  # 红色背景
+                    # 更新表格中的状态为已撤销
+                    self.orders_model.set_status(row, 4)
                 else:
                     QMessageBox.warning(
                         self, "撤销失败", f"❌ 订单撤销失败！\n\n{result['message']}"
@@ -6434,64 +7998,49 @@ class OrdersDialog(QDialog):
 
     def delete_order_record(self, row):
         """删除订单记录（仅从显示中移除）"""
-        reply = QMessageBox.question(
-            self,
+        if self._confirm(
             "删除记录",
             "确定要从列表中删除这条记录吗？\n\n注意：这只是从显示列表中移除，不会影响实际的交易记录。",
-            QMessageBox.Yes | QMessageBox.No,
-            QMessageBox.No,
-        )
-
-        if reply == QMessageBox.Yes:
-            self.orders_table.removeRow(row)
+        ):
+            self.orders_model.remove_row(row)
             QMessageBox.information(self, "删除完成", "✅ 记录已从列表中移除")
 
     def show_order_detail(self, row):
         """显示订单详情"""
-        # 获取订单信息
-        order_data = []
-        headers = []
-
-        for col in range(self.orders_table.columnCount()):
-            header = self.orders_table.horizontalHeaderItem(col)
-            item = self.orders_table.item(row, col)
-
-            if header and item:
-                headers.append(header.text())
-                order_data.append(item.text())
+        # 获取订单信息：表头取模型的常量元组，数据直接取已格式化的整行
+        headers = OrdersModel.HEADERS
+        order_data = self.orders_model.row_texts(row)
 
         # 创建详情文本
-        detail_text = "<h3>📋 订单详情</h3><table border='1' style='border-collapse: collapse; width: 100%;'>"
-
-        for i, (header, data) in enumerate(zip(headers, order_data)):
-            detail_text += f"<tr><td style='padding: 8px; background-color: #f0f0f0; font-weight: bold;'>{header}</td>"
-            detail_text += f"<td style='padding: 8px;'>{data}</td></tr>"
-
-        detail_text += "</table>"
+        parts = [
+            "<h3>📋 订单详情</h3><table border='1' style='border-collapse: collapse; width: 100%;'>"
+        ]
+        parts.extend(
+            f"<tr><td style='padding: 8px; background-color: #f0f0f0; font-weight: bold;'>{header}</td>"
+            f"<td style='padding: 8px;'>{data}</td></tr>"
+            for header, data in zip(headers, order_data)
+        )
+        parts.append("</table>")
+        detail_text = "".join(parts)
 
         # 显示详情对话框
         QMessageBox.information(self, "订单详情", detail_text)
 
     def cancel_selected_order(self):
         """撤销选中的订单"""
-        current_row = self.orders_table.currentRow()
+        current_row = self.orders_table.currentIndex().row()
         if current_row < 0:
             QMessageBox.warning(self, "提示", "请先选择要撤销的订单")
             return
 
         # 获取选中的订单信息
-        order_id_item = self.orders_table.item(current_row, 0)
-        status_item = self.orders_table.item(current_row, 6)
-
-        if not order_id_item or not status_item:
-            QMessageBox.warning(self, "错误", "无法获取订单信息")
-            return
-
-        order_id = order_id_item.text()
-        status_text = status_item.text()
+        order_id = self.orders_model.cell_text(current_row, 0)
+        status_text = self.orders_model.cell_text(
+            current_row, OrdersModel.STATUS_COLUMN
+        )
 
         # 检查订单状态是否可以撤销
-        if status_text not in ["未成交", "部分成交"]:
+        if self.orders_model.status(current_row) not in _CANCELLABLE_STATUSES:
             QMessageBox.warning(
                 self,
                 "无法撤销",